@@ -693,7 +693,11 @@ class UnifiedVoice(nn.Module):
         tmp = torch.zeros(text_inputs.size(0)).to(text_inputs.device)
         duration_emb =  self.speed_emb(torch.zeros_like(tmp).long())
         duration_emb_half = self.speed_emb(torch.ones_like(tmp).long())
-        conds_latent = torch.cat((speech_conditioning_latent + emo_vec.unsqueeze(1), duration_emb_half.unsqueeze(1), duration_emb.unsqueeze(1)), 1)
+        speech_conditioning_latent_emo = speech_conditioning_latent + emo_vec.unsqueeze(1)
+        if speech_conditioning_latent_emo.size(0) != text_inputs.size(0):
+            # a single speaker/emotion condition shared by a batch of texts
+            speech_conditioning_latent_emo = speech_conditioning_latent_emo.expand(text_inputs.size(0), -1, -1)
+        conds_latent = torch.cat((speech_conditioning_latent_emo, duration_emb_half.unsqueeze(1), duration_emb.unsqueeze(1)), 1)
         input_ids, inputs_embeds, attention_mask = self.prepare_gpt_inputs(conds_latent, text_inputs)
         self.inference_model.store_mel_emb(inputs_embeds)
         if input_tokens is None:
@@ -38,7 +38,7 @@ import torch.nn.functional as F
 class IndexTTS2:
     def __init__(
             self, cfg_path="checkpoints/config.yaml", model_dir="checkpoints", use_fp16=False, device=None,
-            use_cuda_kernel=None,use_deepspeed=False
+            use_cuda_kernel=None,use_deepspeed=False, half_dtype=None
     ):
         """
         Args:
@@ -48,6 +48,7 @@ class IndexTTS2:
             device (str): device to use (e.g., 'cuda:0', 'cpu'). If None, it will be set automatically based on the availability of CUDA or MPS.
             use_cuda_kernel (None | bool): whether to use BigVGan custom fused activation CUDA kernel, only for CUDA device.
             use_deepspeed (bool): whether to use DeepSpeed or not.
+            half_dtype (None | torch.dtype): half precision type used when use_fp16 is set, torch.float16 (default) or torch.bfloat16.
         """
         if device is not None:
             self.device = device
@@ -73,7 +74,10 @@ class IndexTTS2:
 
         self.cfg = OmegaConf.load(cfg_path)
         self.model_dir = model_dir
-        self.dtype = torch.float16 if self.use_fp16 else None
+        if self.use_fp16 and half_dtype == torch.bfloat16 and use_deepspeed:
+            print(">> DeepSpeed inference runs in float16, ignoring bfloat16.")
+            half_dtype = torch.float16
+        self.dtype = (half_dtype or torch.float16) if self.use_fp16 else None
         self.stop_mel_token = self.cfg.gpt.stop_mel_token
 
         self.qwen_emo = QwenEmotion(os.path.join(self.model_dir, self.cfg.qwen_emo_path))
@@ -83,7 +87,7 @@ class IndexTTS2:
         load_checkpoint(self.gpt, self.gpt_path)
         self.gpt = self.gpt.to(self.device)
         if self.use_fp16:
-            self.gpt.eval().half()
+            self.gpt.eval().to(self.dtype)
         else:
             self.gpt.eval()
         print(">> GPT weights restored from:", self.gpt_path)
@@ -193,6 +197,9 @@ class IndexTTS2:
         self.cache_emo_audio_prompt = None
         self.cache_mel = None
 
+        # 分段音频异步拷回 CPU 的独立 CUDA stream，与下一段的 GPU 计算重叠
+        self._d2h_stream = torch.cuda.Stream(self.device) if str(self.device).startswith("cuda") else None
+
         # 进度引用显示（可选）
         self.gr_progress = None
         self.model_version = self.cfg.version if hasattr(self.cfg, "version") else None
@@ -288,6 +295,24 @@ class IndexTTS2:
 
         return wavs_list
 
+    def _wav_to_host(self, wav):
+        """
+        Copy a segment waveform to host memory. On CUDA the copy is issued on a side stream so it
+        overlaps with the next segment's GPU work; call `_wait_host_copies()` before reading it.
+        """
+        if self._d2h_stream is None or wav.device.type != "cuda":
+            return wav.cpu()
+        self._d2h_stream.wait_stream(torch.cuda.current_stream(wav.device))
+        with torch.cuda.stream(self._d2h_stream):
+            host_wav = wav.to("cpu", non_blocking=True)
+        # keep the device buffer alive until the side stream has copied it
+        wav.record_stream(self._d2h_stream)
+        return host_wav
+
+    def _wait_host_copies(self):
+        if self._d2h_stream is not None:
+            self._d2h_stream.synchronize()
+
     def _set_gr_progress(self, value, desc):
         if self.gr_progress is not None:
             self.gr_progress(value, desc=desc)
@@ -322,12 +347,215 @@ class IndexTTS2:
 
         return emo_vector
 
+    @torch.no_grad()
+    def _compute_spk_cond(self, spk_audio_prompt, verbose=False):
+        audio,sr = self._load_and_cut_audio(spk_audio_prompt,15,verbose)
+        audio_22k = torchaudio.transforms.Resample(sr, 22050)(audio)
+        audio_16k = torchaudio.transforms.Resample(sr, 16000)(audio)
+
+        inputs = self.extract_features(audio_16k, sampling_rate=16000, return_tensors="pt")
+        input_features = inputs["input_features"]
+        attention_mask = inputs["attention_mask"]
+        input_features = input_features.to(self.device)
+        attention_mask = attention_mask.to(self.device)
+        spk_cond_emb = self.get_emb(input_features, attention_mask)
+
+        _, S_ref = self.semantic_codec.quantize(spk_cond_emb)
+        ref_mel = self.mel_fn(audio_22k.to(spk_cond_emb.device).float())
+        ref_target_lengths = torch.LongTensor([ref_mel.size(2)]).to(ref_mel.device)
+        feat = torchaudio.compliance.kaldi.fbank(audio_16k.to(ref_mel.device),
+                                                 num_mel_bins=80,
+                                                 dither=0,
+                                                 sample_frequency=16000)
+        feat = feat - feat.mean(dim=0, keepdim=True)  # feat2另外一个滤波器能量组特征[922, 80]
+        style = self.campplus_model(feat.unsqueeze(0))  # 参考音频的全局style2[1,192]
+
+        prompt_condition = self.s2mel.models['length_regulator'](S_ref,
+                                                                 ylens=ref_target_lengths,
+                                                                 n_quantizers=3,
+                                                                 f0=None)[0]
+        return spk_cond_emb, style, prompt_condition, ref_mel
+
+    @torch.no_grad()
+    def _compute_emo_cond(self, emo_audio_prompt, verbose=False):
+        emo_audio, _ = self._load_and_cut_audio(emo_audio_prompt,15,verbose,sr=16000)
+        emo_inputs = self.extract_features(emo_audio, sampling_rate=16000, return_tensors="pt")
+        emo_input_features = emo_inputs["input_features"]
+        emo_attention_mask = emo_inputs["attention_mask"]
+        emo_input_features = emo_input_features.to(self.device)
+        emo_attention_mask = emo_attention_mask.to(self.device)
+        return self.get_emb(emo_input_features, emo_attention_mask)
+
+    def _get_spk_cond(self, spk_audio_prompt, verbose=False):
+        """
+        Compute (or reuse the cached) speaker conditioning for a reference audio.
+        Returns: (spk_cond_emb, style, prompt_condition, ref_mel)
+        """
+        # 如果参考音频改变了，才需要重新生成, 提升速度
+        if self.cache_spk_cond is None or self.cache_spk_audio_prompt != spk_audio_prompt:
+            if self.cache_spk_cond is not None:
+                self.cache_spk_cond = None
+                self.cache_s2mel_style = None
+                self.cache_s2mel_prompt = None
+                self.cache_mel = None
+                torch.cuda.empty_cache()
+            spk_cond_emb, style, prompt_condition, ref_mel = self._compute_spk_cond(spk_audio_prompt, verbose)
+
+            self.cache_spk_cond = spk_cond_emb
+            self.cache_s2mel_style = style
+            self.cache_s2mel_prompt = prompt_condition
+            self.cache_spk_audio_prompt = spk_audio_prompt
+            self.cache_mel = ref_mel
+        else:
+            style = self.cache_s2mel_style
+            prompt_condition = self.cache_s2mel_prompt
+            spk_cond_emb = self.cache_spk_cond
+            ref_mel = self.cache_mel
+        return spk_cond_emb, style, prompt_condition, ref_mel
+
+    def _get_emo_cond(self, emo_audio_prompt, verbose=False):
+        """
+        Compute (or reuse the cached) emotion conditioning for a reference audio.
+        """
+        if self.cache_emo_cond is None or self.cache_emo_audio_prompt != emo_audio_prompt:
+            if self.cache_emo_cond is not None:
+                self.cache_emo_cond = None
+                torch.cuda.empty_cache()
+            emo_cond_emb = self._compute_emo_cond(emo_audio_prompt, verbose)
+
+            self.cache_emo_cond = emo_cond_emb
+            self.cache_emo_audio_prompt = emo_audio_prompt
+        else:
+            emo_cond_emb = self.cache_emo_cond
+        return emo_cond_emb
+
+    def encode_speaker_prompt(self, spk_audio_prompt, verbose=False):
+        """
+        Encode a speaker reference audio once, so that it can be passed to ``infer()`` /
+        ``infer_batch()`` as ``spk_cond=`` instead of re-encoding the audio on every call.
+        The speaker audio is also encoded as the default emotion reference.
+        Returns: dict of conditioning tensors on the model device
+        """
+        spk_cond_emb, style, prompt_condition, ref_mel = self._compute_spk_cond(spk_audio_prompt, verbose)
+        return {
+            "spk_audio_prompt": spk_audio_prompt,
+            "spk_cond_emb": spk_cond_emb,
+            "style": style,
+            "prompt_condition": prompt_condition,
+            "ref_mel": ref_mel,
+            "emo_cond_emb": self._compute_emo_cond(spk_audio_prompt, verbose),
+        }
+
+    def _resolve_conds(self, spk_audio_prompt, emo_audio_prompt, spk_cond=None, verbose=False):
+        """
+        Returns: (spk_cond_emb, style, prompt_condition, ref_mel, emo_cond_emb), preferring the
+        precomputed ``spk_cond`` from ``encode_speaker_prompt()`` when given.
+        """
+        if spk_cond is not None:
+            spk_cond_emb, style, prompt_condition, ref_mel = (
+                spk_cond["spk_cond_emb"], spk_cond["style"], spk_cond["prompt_condition"], spk_cond["ref_mel"])
+        else:
+            spk_cond_emb, style, prompt_condition, ref_mel = self._get_spk_cond(spk_audio_prompt, verbose)
+        if spk_cond is not None and emo_audio_prompt == spk_cond["spk_audio_prompt"]:
+            emo_cond_emb = spk_cond["emo_cond_emb"]
+        else:
+            emo_cond_emb = self._get_emo_cond(emo_audio_prompt, verbose)
+        return spk_cond_emb, style, prompt_condition, ref_mel, emo_cond_emb
+
+    def _get_emovec_mat(self, emo_vector, style, use_random=False):
+        """
+        Mix the per-emotion speaker matrices with the given emotion vector.
+        Returns: (weight_vector, emovec_mat)
+        """
+        weight_vector = torch.as_tensor(emo_vector, device=self.device)
+        if use_random:
+            random_index = [random.randint(0, x - 1) for x in self.emo_num]
+        else:
+            random_index = [find_most_similar_cosine(style, tmp) for tmp in self.spk_matrix]
+
+        emo_matrix = [tmp[index].unsqueeze(0) for index, tmp in zip(random_index, self.emo_matrix)]
+        emo_matrix = torch.cat(emo_matrix, 0)
+        emovec_mat = weight_vector.unsqueeze(1) * emo_matrix
+        emovec_mat = torch.sum(emovec_mat, 0)
+        emovec_mat = emovec_mat.unsqueeze(0)
+        return weight_vector, emovec_mat
+
+    @torch.no_grad()
+    def _codes_to_wav(self, codes, code_lens, text_tokens, speech_conditioning_latent,
+                      spk_cond_emb, emo_cond_emb, emovec, prompt_condition, ref_mel, style,
+                      timings, verbose=False):
+        """
+        Decode the GPT mel codes of a single text segment into a waveform (GPT latent -> s2mel -> BigVGAN).
+        codes: [1, T]
+        Returns: int16-range float waveform [1, N] on the model device
+        """
+        m_start_time = time.perf_counter()
+        use_speed = torch.zeros(spk_cond_emb.size(0)).to(spk_cond_emb.device).long()
+        with torch.amp.autocast(text_tokens.device.type, enabled=self.dtype is not None, dtype=self.dtype):
+            latent = self.gpt(
+                speech_conditioning_latent,
+                text_tokens,
+                torch.tensor([text_tokens.shape[-1]], device=text_tokens.device),
+                codes,
+                torch.tensor([codes.shape[-1]], device=text_tokens.device),
+                emo_cond_emb,
+                cond_mel_lengths=torch.tensor([spk_cond_emb.shape[-1]], device=text_tokens.device),
+                emo_cond_mel_lengths=torch.tensor([emo_cond_emb.shape[-1]], device=text_tokens.device),
+                emo_vec=emovec,
+                use_speed=use_speed,
+            )
+            timings["gpt_forward_time"] += time.perf_counter() - m_start_time
+
+        dtype = None
+        with torch.amp.autocast(text_tokens.device.type, enabled=dtype is not None, dtype=dtype):
+            m_start_time = time.perf_counter()
+            diffusion_steps = 25
+            inference_cfg_rate = 0.7
+            latent = self.s2mel.models['gpt_layer'](latent)
+            S_infer = self.semantic_codec.quantizer.vq2emb(codes.unsqueeze(1))
+            S_infer = S_infer.transpose(1, 2)
+            S_infer = S_infer + latent
+            target_lengths = (code_lens * 1.72).long()
+
+            cond = self.s2mel.models['length_regulator'](S_infer,
+                                                         ylens=target_lengths,
+                                                         n_quantizers=3,
+                                                         f0=None)[0]
+            cat_condition = torch.cat([prompt_condition, cond], dim=1)
+            vc_target = self.s2mel.models['cfm'].inference(cat_condition,
+                                                           torch.LongTensor([cat_condition.size(1)]).to(
+                                                               cond.device),
+                                                           ref_mel, style, None, diffusion_steps,
+                                                           inference_cfg_rate=inference_cfg_rate)
+            vc_target = vc_target[:, :, ref_mel.size(-1):]
+            timings["s2mel_time"] += time.perf_counter() - m_start_time
+
+            m_start_time = time.perf_counter()
+            wav = self.bigvgan(vc_target.float()).squeeze().unsqueeze(0)
+            print(wav.shape)
+            timings["bigvgan_time"] += time.perf_counter() - m_start_time
+            wav = wav.squeeze(1)
+
+        wav = torch.clamp(32767 * wav, -32767.0, 32767.0)
+        if verbose:
+            print(f"wav shape: {wav.shape}", "min:", wav.min(), "max:", wav.max())
+        return wav
+
     # 原始推理模式
     def infer(self, spk_audio_prompt, text, output_path,
               emo_audio_prompt=None, emo_alpha=1.0,
               emo_vector=None,
               use_emo_text=False, emo_text=None, use_random=False, interval_silence=200,
-              verbose=False, max_text_tokens_per_segment=120, **generation_kwargs):
+              verbose=False, max_text_tokens_per_segment=120, spk_cond=None, return_tensor=False,
+              **generation_kwargs):
+        """
+        ``spk_cond``: optional precomputed speaker conditioning from ``encode_speaker_prompt()``;
+        when given, ``spk_audio_prompt`` may be None and the reference audio is not re-encoded.
+        ``return_tensor``: when ``output_path`` is empty, return ``(wav, sampling_rate)`` with an
+        int16 ``[1, N]`` tensor instead of the Gradio ``(sampling_rate, wav_data)`` tuple.
+        """
+        if spk_audio_prompt is None and spk_cond is not None:
+            spk_audio_prompt = spk_cond["spk_audio_prompt"]
         print(">> starting inference...")
         self._set_gr_progress(0, "starting inference...")
         if verbose:
@@ -358,7 +586,10 @@ class IndexTTS2:
             emo_vector_scale = max(0.0, min(1.0, emo_alpha))
             if emo_vector_scale != 1.0:
                 # scale each vector and truncate to 4 decimals (for nicer printing)
-                emo_vector = [int(x * emo_vector_scale * 10000) / 10000 for x in emo_vector]
+                if isinstance(emo_vector, torch.Tensor):
+                    emo_vector = torch.trunc(emo_vector * (emo_vector_scale * 10000)) / 10000
+                else:
+                    emo_vector = [int(x * emo_vector_scale * 10000) / 10000 for x in emo_vector]
                 print(f"scaled emotion vectors to {emo_vector_scale}x: {emo_vector}")
 
         if emo_audio_prompt is None:
@@ -368,80 +599,11 @@ class IndexTTS2:
             # must always use alpha=1.0 when we don't have an external reference voice
             emo_alpha = 1.0
 
-        # 如果参考音频改变了，才需要重新生成, 提升速度
-        if self.cache_spk_cond is None or self.cache_spk_audio_prompt != spk_audio_prompt:
-            if self.cache_spk_cond is not None:
-                self.cache_spk_cond = None
-                self.cache_s2mel_style = None
-                self.cache_s2mel_prompt = None
-                self.cache_mel = None
-                torch.cuda.empty_cache()
-            audio,sr = self._load_and_cut_audio(spk_audio_prompt,15,verbose)
-            audio_22k = torchaudio.transforms.Resample(sr, 22050)(audio)
-            audio_16k = torchaudio.transforms.Resample(sr, 16000)(audio)
-
-            inputs = self.extract_features(audio_16k, sampling_rate=16000, return_tensors="pt")
-            input_features = inputs["input_features"]
-            attention_mask = inputs["attention_mask"]
-            input_features = input_features.to(self.device)
-            attention_mask = attention_mask.to(self.device)
-            spk_cond_emb = self.get_emb(input_features, attention_mask)
-
-            _, S_ref = self.semantic_codec.quantize(spk_cond_emb)
-            ref_mel = self.mel_fn(audio_22k.to(spk_cond_emb.device).float())
-            ref_target_lengths = torch.LongTensor([ref_mel.size(2)]).to(ref_mel.device)
-            feat = torchaudio.compliance.kaldi.fbank(audio_16k.to(ref_mel.device),
-                                                     num_mel_bins=80,
-                                                     dither=0,
-                                                     sample_frequency=16000)
-            feat = feat - feat.mean(dim=0, keepdim=True)  # feat2另外一个滤波器能量组特征[922, 80]
-            style = self.campplus_model(feat.unsqueeze(0))  # 参考音频的全局style2[1,192]
-
-            prompt_condition = self.s2mel.models['length_regulator'](S_ref,
-                                                                     ylens=ref_target_lengths,
-                                                                     n_quantizers=3,
-                                                                     f0=None)[0]
-
-            self.cache_spk_cond = spk_cond_emb
-            self.cache_s2mel_style = style
-            self.cache_s2mel_prompt = prompt_condition
-            self.cache_spk_audio_prompt = spk_audio_prompt
-            self.cache_mel = ref_mel
-        else:
-            style = self.cache_s2mel_style
-            prompt_condition = self.cache_s2mel_prompt
-            spk_cond_emb = self.cache_spk_cond
-            ref_mel = self.cache_mel
+        spk_cond_emb, style, prompt_condition, ref_mel, emo_cond_emb = self._resolve_conds(
+            spk_audio_prompt, emo_audio_prompt, spk_cond, verbose)
 
         if emo_vector is not None:
-            weight_vector = torch.tensor(emo_vector).to(self.device)
-            if use_random:
-                random_index = [random.randint(0, x - 1) for x in self.emo_num]
-            else:
-                random_index = [find_most_similar_cosine(style, tmp) for tmp in self.spk_matrix]
-
-            emo_matrix = [tmp[index].unsqueeze(0) for index, tmp in zip(random_index, self.emo_matrix)]
-            emo_matrix = torch.cat(emo_matrix, 0)
-            emovec_mat = weight_vector.unsqueeze(1) * emo_matrix
-            emovec_mat = torch.sum(emovec_mat, 0)
-            emovec_mat = emovec_mat.unsqueeze(0)
-
-        if self.cache_emo_cond is None or self.cache_emo_audio_prompt != emo_audio_prompt:
-            if self.cache_emo_cond is not None:
-                self.cache_emo_cond = None
-                torch.cuda.empty_cache()
-            emo_audio, _ = self._load_and_cut_audio(emo_audio_prompt,15,verbose,sr=16000)
-            emo_inputs = self.extract_features(emo_audio, sampling_rate=16000, return_tensors="pt")
-            emo_input_features = emo_inputs["input_features"]
-            emo_attention_mask = emo_inputs["attention_mask"]
-            emo_input_features = emo_input_features.to(self.device)
-            emo_attention_mask = emo_attention_mask.to(self.device)
-            emo_cond_emb = self.get_emb(emo_input_features, emo_attention_mask)
-
-            self.cache_emo_cond = emo_cond_emb
-            self.cache_emo_audio_prompt = emo_audio_prompt
-        else:
-            emo_cond_emb = self.cache_emo_cond
+            weight_vector, emovec_mat = self._get_emovec_mat(emo_vector, style, use_random)
 
         self._set_gr_progress(0.1, "text processing...")
         text_tokens_list = self.tokenizer.tokenize(text)
@@ -465,9 +627,7 @@ class IndexTTS2:
 
         wavs = []
         gpt_gen_time = 0
-        gpt_forward_time = 0
-        s2mel_time = 0
-        bigvgan_time = 0
+        timings = {"gpt_forward_time": 0, "s2mel_time": 0, "bigvgan_time": 0}
         has_warned = False
         for seg_idx, sent in enumerate(segments):
             self._set_gr_progress(0.2 + 0.7 * seg_idx / segments_count,
@@ -549,58 +709,12 @@ class IndexTTS2:
                     print(f"fix codes shape: {codes.shape}, codes type: {codes.dtype}")
                     print(f"code len: {code_lens}")
 
-                m_start_time = time.perf_counter()
-                use_speed = torch.zeros(spk_cond_emb.size(0)).to(spk_cond_emb.device).long()
-                with torch.amp.autocast(text_tokens.device.type, enabled=self.dtype is not None, dtype=self.dtype):
-                    latent = self.gpt(
-                        speech_conditioning_latent,
-                        text_tokens,
-                        torch.tensor([text_tokens.shape[-1]], device=text_tokens.device),
-                        codes,
-                        torch.tensor([codes.shape[-1]], device=text_tokens.device),
-                        emo_cond_emb,
-                        cond_mel_lengths=torch.tensor([spk_cond_emb.shape[-1]], device=text_tokens.device),
-                        emo_cond_mel_lengths=torch.tensor([emo_cond_emb.shape[-1]], device=text_tokens.device),
-                        emo_vec=emovec,
-                        use_speed=use_speed,
-                    )
-                    gpt_forward_time += time.perf_counter() - m_start_time
-
-                dtype = None
-                with torch.amp.autocast(text_tokens.device.type, enabled=dtype is not None, dtype=dtype):
-                    m_start_time = time.perf_counter()
-                    diffusion_steps = 25
-                    inference_cfg_rate = 0.7
-                    latent = self.s2mel.models['gpt_layer'](latent)
-                    S_infer = self.semantic_codec.quantizer.vq2emb(codes.unsqueeze(1))
-                    S_infer = S_infer.transpose(1, 2)
-                    S_infer = S_infer + latent
-                    target_lengths = (code_lens * 1.72).long()
-
-                    cond = self.s2mel.models['length_regulator'](S_infer,
-                                                                 ylens=target_lengths,
-                                                                 n_quantizers=3,
-                                                                 f0=None)[0]
-                    cat_condition = torch.cat([prompt_condition, cond], dim=1)
-                    vc_target = self.s2mel.models['cfm'].inference(cat_condition,
-                                                                   torch.LongTensor([cat_condition.size(1)]).to(
-                                                                       cond.device),
-                                                                   ref_mel, style, None, diffusion_steps,
-                                                                   inference_cfg_rate=inference_cfg_rate)
-                    vc_target = vc_target[:, :, ref_mel.size(-1):]
-                    s2mel_time += time.perf_counter() - m_start_time
-
-                    m_start_time = time.perf_counter()
-                    wav = self.bigvgan(vc_target.float()).squeeze().unsqueeze(0)
-                    print(wav.shape)
-                    bigvgan_time += time.perf_counter() - m_start_time
-                    wav = wav.squeeze(1)
-
-                wav = torch.clamp(32767 * wav, -32767.0, 32767.0)
-                if verbose:
-                    print(f"wav shape: {wav.shape}", "min:", wav.min(), "max:", wav.max())
+                wav = self._codes_to_wav(codes, code_lens, text_tokens, speech_conditioning_latent,
+                                         spk_cond_emb, emo_cond_emb, emovec,
+                                         prompt_condition, ref_mel, style, timings, verbose)
                 # wavs.append(wav[:, :-512])
-                wavs.append(wav.cpu())  # to cpu before saving
+                wavs.append(self._wav_to_host(wav))  # to cpu before saving
+        self._wait_host_copies()
         end_time = time.perf_counter()
 
         self._set_gr_progress(0.9, "saving audio...")
@@ -608,9 +722,9 @@ class IndexTTS2:
         wav = torch.cat(wavs, dim=1)
         wav_length = wav.shape[-1] / sampling_rate
         print(f">> gpt_gen_time: {gpt_gen_time:.2f} seconds")
-        print(f">> gpt_forward_time: {gpt_forward_time:.2f} seconds")
-        print(f">> s2mel_time: {s2mel_time:.2f} seconds")
-        print(f">> bigvgan_time: {bigvgan_time:.2f} seconds")
+        print(f">> gpt_forward_time: {timings['gpt_forward_time']:.2f} seconds")
+        print(f">> s2mel_time: {timings['s2mel_time']:.2f} seconds")
+        print(f">> bigvgan_time: {timings['bigvgan_time']:.2f} seconds")
         print(f">> Total inference time: {end_time - start_time:.2f} seconds")
         print(f">> Generated audio length: {wav_length:.2f} seconds")
         print(f">> RTF: {(end_time - start_time) / wav_length:.4f}")
@@ -627,6 +741,8 @@ class IndexTTS2:
             torchaudio.save(output_path, wav.type(torch.int16), sampling_rate)
             print(">> wav file saved to:", output_path)
             return output_path
+        elif return_tensor:
+            return wav.type(torch.int16), sampling_rate
         else:
             # 返回以符合Gradio的格式要求
             wav_data = wav.type(torch.int16)
@@ -634,6 +750,176 @@ class IndexTTS2:
             return (sampling_rate, wav_data)
 
 
+    # 批量推理模式：多段文本共享同一参考音频与情感条件，GPT 自回归生成按 batch 并行
+    def infer_batch(self, spk_audio_prompt, texts, output_paths=None,
+                    emo_audio_prompt=None, emo_alpha=1.0, emo_vector=None,
+                    use_emo_text=False, emo_text=None, use_random=False, interval_silence=200, verbose=False,
+                    max_text_tokens_per_segment=120, max_batch_size=4, spk_cond=None, return_tensor=False,
+                    **generation_kwargs):
+        """
+        Synthesize several texts that share the same speaker prompt and emotion settings.
+        The speaker/emotion conditioning is computed once, and the GPT autoregressive stage
+        runs on padded batches of text segments.
+
+        Args:
+            texts (List[str]): texts to synthesize, one audio per text.
+            output_paths (List[str] | None): output path for each text. If None, returns
+                ``(sampling_rate, wav_data)`` tuples in the same format as ``infer()``.
+            use_emo_text (bool): detect the emotion vector from ``emo_text`` (default: all ``texts``
+                joined), once for the whole batch.
+            max_batch_size (int): max number of text segments per GPT batch, forced to 1 on CPU.
+            spk_cond (dict | None): precomputed speaker conditioning from ``encode_speaker_prompt()``.
+            return_tensor (bool): without ``output_paths``, return ``(wav, sampling_rate)`` tuples
+                with int16 ``[1, N]`` tensors instead.
+        Returns:
+            List of output paths or audio tuples (see ``return_tensor``), in the order of ``texts``.
+        """
+        if not texts:
+            return []
+        if spk_audio_prompt is None and spk_cond is not None:
+            spk_audio_prompt = spk_cond["spk_audio_prompt"]
+        print(f">> starting batch inference for {len(texts)} texts...")
+        if output_paths is not None and len(output_paths) != len(texts):
+            raise ValueError(f"got {len(output_paths)} output_paths for {len(texts)} texts")
+        start_time = time.perf_counter()
+
+        if use_emo_text:
+            if emo_text is None:
+                emo_text = " ".join(texts)
+            emo_dict = self.qwen_emo.inference(emo_text)
+            print(f"detected emotion vectors from text: {emo_dict}")
+            emo_vector = list(emo_dict.values())
+
+        if emo_vector is not None:
+            emo_audio_prompt = None
+            emo_vector_scale = max(0.0, min(1.0, emo_alpha))
+            if emo_vector_scale != 1.0:
+                if isinstance(emo_vector, torch.Tensor):
+                    emo_vector = torch.trunc(emo_vector * (emo_vector_scale * 10000)) / 10000
+                else:
+                    emo_vector = [int(x * emo_vector_scale * 10000) / 10000 for x in emo_vector]
+        if emo_audio_prompt is None:
+            emo_audio_prompt = spk_audio_prompt
+            emo_alpha = 1.0
+
+        spk_cond_emb, style, prompt_condition, ref_mel, emo_cond_emb = self._resolve_conds(
+            spk_audio_prompt, emo_audio_prompt, spk_cond, verbose)
+        if emo_vector is not None:
+            weight_vector, emovec_mat = self._get_emovec_mat(emo_vector, style, use_random)
+
+        cond_lengths = torch.tensor([spk_cond_emb.shape[-1]], device=self.device)
+        emo_cond_lengths = torch.tensor([emo_cond_emb.shape[-1]], device=self.device)
+        with torch.no_grad():
+            with torch.amp.autocast(spk_cond_emb.device.type, enabled=self.dtype is not None, dtype=self.dtype):
+                emovec = self.gpt.merge_emovec(spk_cond_emb, emo_cond_emb, cond_lengths, emo_cond_lengths,
+                                               alpha=emo_alpha)
+                if emo_vector is not None:
+                    emovec = emovec_mat + (1 - torch.sum(weight_vector)) * emovec
+
+        # flatten the segments of all texts, remembering which text each one belongs to
+        items = []
+        for text_idx, text in enumerate(texts):
+            text_tokens_list = self.tokenizer.tokenize(text)
+            for sent in self.tokenizer.split_segments(text_tokens_list, max_text_tokens_per_segment):
+                text_tokens = self.tokenizer.convert_tokens_to_ids(sent)
+                items.append((text_idx, torch.tensor(text_tokens, dtype=torch.int32, device=self.device)))
+        if verbose:
+            print("segments count:", len(items))
+
+        top_p = generation_kwargs.pop("top_p", 0.8)
+        top_k = generation_kwargs.pop("top_k", 30)
+        temperature = generation_kwargs.pop("temperature", 0.8)
+        length_penalty = generation_kwargs.pop("length_penalty", 0.0)
+        num_beams = generation_kwargs.pop("num_beams", 3)
+        repetition_penalty = generation_kwargs.pop("repetition_penalty", 10.0)
+        max_mel_tokens = generation_kwargs.pop("max_mel_tokens", 1500)
+        generation_kwargs.pop("do_sample", None)
+        sampling_rate = 22050
+        batch_size = max(1, max_batch_size) if self.device != "cpu" else 1
+
+        text_wavs = [[] for _ in texts]
+        gpt_gen_time = 0
+        timings = {"gpt_forward_time": 0, "s2mel_time": 0, "bigvgan_time": 0}
+        has_warned = False
+        for batch_start in range(0, len(items), batch_size):
+            batch = items[batch_start:batch_start + batch_size]
+            self._set_gr_progress(0.1 + 0.8 * batch_start / len(items),
+                                  f"speech synthesis {batch_start + 1}/{len(items)}...")
+            # right-pad with stop_text_token; `prepare_gpt_inputs` moves the padding to the left
+            batch_text_tokens = pad_sequence([tokens for _, tokens in batch], batch_first=True,
+                                             padding_value=self.cfg.gpt.stop_text_token)
+            m_start_time = time.perf_counter()
+            with torch.no_grad():
+                with torch.amp.autocast(batch_text_tokens.device.type, enabled=self.dtype is not None, dtype=self.dtype):
+                    batch_codes, speech_conditioning_latent = self.gpt.inference_speech(
+                        spk_cond_emb,
+                        batch_text_tokens,
+                        emo_cond_emb,
+                        cond_lengths=cond_lengths,
+                        emo_cond_lengths=emo_cond_lengths,
+                        emo_vec=emovec,
+                        do_sample=True,
+                        top_p=top_p,
+                        top_k=top_k,
+                        temperature=temperature,
+                        num_return_sequences=1,
+                        length_penalty=length_penalty,
+                        num_beams=num_beams,
+                        repetition_penalty=repetition_penalty,
+                        max_generate_length=max_mel_tokens,
+                        **generation_kwargs
+                    )
+            gpt_gen_time += time.perf_counter() - m_start_time
+
+            for (text_idx, text_tokens), codes in zip(batch, batch_codes):
+                stop_idx = (codes == self.stop_mel_token).nonzero(as_tuple=False)
+                if len(stop_idx) > 0:
+                    code_len = stop_idx[0].item()
+                else:
+                    code_len = codes.size(0)
+                    if not has_warned:
+                        warnings.warn(
+                            f"WARN: generation stopped due to exceeding `max_mel_tokens` ({max_mel_tokens}). "
+                            f"Consider reducing `max_text_tokens_per_segment`({max_text_tokens_per_segment}) or increasing `max_mel_tokens`.",
+                            category=RuntimeWarning
+                        )
+                        has_warned = True
+                codes = codes[:code_len].unsqueeze(0)
+                code_lens = torch.LongTensor([code_len]).to(self.device)
+                wav = self._codes_to_wav(codes, code_lens, text_tokens.unsqueeze(0), speech_conditioning_latent,
+                                         spk_cond_emb, emo_cond_emb, emovec,
+                                         prompt_condition, ref_mel, style, timings, verbose)
+                text_wavs[text_idx].append(self._wav_to_host(wav))
+        self._wait_host_copies()
+        end_time = time.perf_counter()
+
+        self._set_gr_progress(0.9, "saving audio...")
+        results = []
+        wav_length = 0
+        for text_idx, wavs in enumerate(text_wavs):
+            wavs = self.insert_interval_silence(wavs, sampling_rate=sampling_rate, interval_silence=interval_silence)
+            wav = torch.cat(wavs, dim=1).type(torch.int16)
+            wav_length += wav.shape[-1] / sampling_rate
+            if output_paths is not None:
+                output_path = output_paths[text_idx]
+                if os.path.dirname(output_path) != "":
+                    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                torchaudio.save(output_path, wav, sampling_rate)
+                results.append(output_path)
+            elif return_tensor:
+                results.append((wav, sampling_rate))
+            else:
+                results.append((sampling_rate, wav.numpy().T))
+        print(f">> gpt_gen_time: {gpt_gen_time:.2f} seconds")
+        print(f">> gpt_forward_time: {timings['gpt_forward_time']:.2f} seconds")
+        print(f">> s2mel_time: {timings['s2mel_time']:.2f} seconds")
+        print(f">> bigvgan_time: {timings['bigvgan_time']:.2f} seconds")
+        print(f">> Total batch inference time: {end_time - start_time:.2f} seconds")
+        print(f">> Generated audio length: {wav_length:.2f} seconds")
+        print(f">> [batch] texts: {len(texts)} segments: {len(items)} max_batch_size: {batch_size}")
+        print(f">> [batch] RTF: {(end_time - start_time) / wav_length:.4f}")
+        return results
+
 def find_most_similar_cosine(query_vector, matrix):
     query_vector = query_vector.float()
     matrix = matrix.float()
@@ -0,0 +1,55 @@
+"""
+Character configuration resolution shared by the multi-character command line scripts
+"""
+
+import os
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_DEFAULT_CONFIG = os.path.normpath(os.path.join(_SCRIPT_DIR, '..', 'config', 'character_config.json'))
+
+
+@lru_cache(maxsize=None)
+def default_config_path() -> Optional[str]:
+    """The bundled config/character_config.json, or None if it doesn't exist (checked once)"""
+    return _DEFAULT_CONFIG if os.path.exists(_DEFAULT_CONFIG) else None
+
+
+def resolve_config_source(args_config: Optional[str], embedded: Optional[Dict[str, Any]],
+                          info: Callable[[str], Any] = print,
+                          warning: Callable[[str], Any] = lambda msg: print(f"Warning: {msg}")
+                          ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Pick the character configuration for a run
+
+    An embedded character_config from the JSON input wins over --config,
+    which wins over the default config.
+
+    Args:
+        args_config: Path given with --config, if any
+        embedded: character_config embedded in the JSON input, if any
+        info: Callback for informational messages
+        warning: Callback for warnings
+
+    Returns:
+        (config_path, config_dict), at most one of them set; both None if no configuration was found
+
+    Raises:
+        FileNotFoundError: If args_config doesn't exist
+    """
+    if embedded:
+        if args_config:
+            warning("Both --config and embedded character_config provided. Using embedded config.")
+        info("Using embedded character configuration from JSON input")
+        return None, embedded
+
+    if args_config:
+        if not os.path.exists(args_config):
+            raise FileNotFoundError(f"Configuration file {args_config} not found")
+        return args_config, None
+
+    default_config = default_config_path()
+    if default_config:
+        info(f"Using default character configuration: {default_config}")
+    return default_config, None
@@ -24,10 +24,14 @@ import re
 import sys
 import argparse
 import json
-from typing import List, Dict, Tuple, Optional
-import tempfile
-import shutil
+import threading
+from array import array
+from dataclasses import dataclass, field
+from enum import IntEnum
+from itertools import groupby
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator
 from pathlib import Path
+from types import MappingProxyType
 
 # Add current directory to path for IndexTTS imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -38,6 +42,7 @@ try:
     from indextts.infer_v2 import IndexTTS2
     import torch
     import torchaudio
+    import soundfile as sf
     import librosa
     import numpy as np
 except ImportError as e:
@@ -45,70 +50,190 @@ except ImportError as e:
     print("Please ensure IndexTTS2 is properly installed with 'uv sync --all-extras'")
     sys.exit(1)
 
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    # Without numba parse_emotion_tags always uses its pure Python loop
+    _HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+class Emotion(IntEnum):
+    """IndexTTS2 emotions, valued by their index in the emotion vector"""
+    HAPPY = 0
+    ANGRY = 1
+    SAD = 2
+    AFRAID = 3
+    DISGUSTED = 4
+    MELANCHOLIC = 5
+    SURPRISED = 6
+    CALM = 7
+
+    def __str__(self):
+        return self.name.lower()
+
+    def __format__(self, format_spec):
+        return format(str(self), format_spec)
+
+    @classmethod
+    def from_name(cls, name, default: 'Emotion' = None) -> 'Emotion':
+        """Emotion for a name such as 'happy' (or an Emotion), default (calm) if unknown"""
+        if isinstance(name, cls):
+            return name
+        return cls.__members__.get(str(name).upper(), cls.CALM if default is None else default)
+
+
+# One-hot emotion vectors, row i is the vector for Emotion(i)
+_EMO_BASIS_NP = np.eye(len(Emotion), dtype=np.float32)
+_EMO_BASIS_NP.flags.writeable = False
+
+# Supported emotion tag names and the IndexTTS2 emotion they map to (read-only, built once)
+_EMOTION_MAPPING = MappingProxyType({
+    'happy': Emotion.HAPPY,
+    'happiness': Emotion.HAPPY,
+    'joy': Emotion.HAPPY,
+    'excited': Emotion.HAPPY,
+
+    'sad': Emotion.SAD,
+    'sadness': Emotion.SAD,
+    'melancholy': Emotion.MELANCHOLIC,
+    'melancholic': Emotion.MELANCHOLIC,
+    'depressed': Emotion.MELANCHOLIC,
+
+    'angry': Emotion.ANGRY,
+    'anger': Emotion.ANGRY,
+    'rage': Emotion.ANGRY,
+    'fury': Emotion.ANGRY,
+
+    'afraid': Emotion.AFRAID,
+    'fear': Emotion.AFRAID,
+    'scared': Emotion.AFRAID,
+    'terrified': Emotion.AFRAID,
+
+    'disgusted': Emotion.DISGUSTED,
+    'disgust': Emotion.DISGUSTED,
+    'revolted': Emotion.DISGUSTED,
+
+    'surprised': Emotion.SURPRISED,
+    'surprise': Emotion.SURPRISED,
+    'amazed': Emotion.SURPRISED,
+    'shocked': Emotion.SURPRISED,
+
+    'calm': Emotion.CALM,
+    'neutral': Emotion.CALM,
+    'normal': Emotion.CALM,
+    'peaceful': Emotion.CALM,
+
+    # Chinese mappings
+    '高兴': Emotion.HAPPY,
+    '快乐': Emotion.HAPPY,
+    '愤怒': Emotion.ANGRY,
+    '生气': Emotion.ANGRY,
+    '悲伤': Emotion.SAD,
+    '难过': Emotion.SAD,
+    '恐惧': Emotion.AFRAID,
+    '害怕': Emotion.AFRAID,
+    '反感': Emotion.DISGUSTED,
+    '厌恶': Emotion.DISGUSTED,
+    '低落': Emotion.MELANCHOLIC,
+    '忧郁': Emotion.MELANCHOLIC,
+    '惊讶': Emotion.SURPRISED,
+    '吃惊': Emotion.SURPRISED,
+    '自然': Emotion.CALM,
+    '平静': Emotion.CALM,
+})
+_EMO_GET = _EMOTION_MAPPING.get
+
+# Emotion tags in a single pass: multi-character tags {[character]:[emotion_name:alpha]}
+# (the character is ignored with a single voice), or plain [emotion_name:alpha] / [emotion_name].
+# Every non-empty [...] is consumed as a tag, whatever its alpha, so no tag is read aloud.
+_COMBINED_RE = re.compile(
+    r'\{\[\s*(?P<char>[^\]]+?)\s*\]:\[\s*(?P<emo>[^\]:]+?)\s*(?::\s*(?P<alpha>[^\]]*?)\s*)?\]\}'
+    r'|\[(?=[^\]])\s*(?P<emo2>[^\]:]*?)\s*(?::\s*(?P<alpha2>[^\]]*?)\s*)?\]'
+)
+
+
+def _tag_alpha(alpha: Optional[str]) -> float:
+    """Alpha of an emotion tag clamped to [0.0, 1.0], 1.0 if missing or not a number"""
+    if not alpha:
+        return 1.0
+    try:
+        return max(0.0, min(1.0, float(alpha)))
+    except ValueError:
+        return 1.0
+
+
+# Tag count from which parse_emotion_tags strips segment spans with the numba kernel
+_JIT_MIN_TAGS = 1000
+
+
+@njit(cache=True)
+def _is_space(cp):
+    """Same whitespace code points as str.isspace()"""
+    return (9 <= cp <= 13 or 28 <= cp <= 32 or cp == 0x85 or cp == 0xa0 or cp == 0x1680
+            or 0x2000 <= cp <= 0x200a or cp == 0x2028 or cp == 0x2029 or cp == 0x202f
+            or cp == 0x205f or cp == 0x3000)
+
+
+@njit(cache=True)
+def _strip_spans(codepoints, starts, ends):
+    """Shrink each [start, end) span of codepoints to exclude leading/trailing whitespace"""
+    n = starts.shape[0]
+    out_starts = np.empty(n, np.int64)
+    out_ends = np.empty(n, np.int64)
+    for i in range(n):
+        start = starts[i]
+        end = ends[i]
+        while start < end and _is_space(codepoints[start]):
+            start += 1
+        while end > start and _is_space(codepoints[end - 1]):
+            end -= 1
+        out_starts[i] = start
+        out_ends[i] = end
+    return out_starts, out_ends
+
+
+@dataclass
+class ParsedSegments:
+    """
+    Emotion segments parsed from tagged text, stored as parallel columns.
+    Segment i is (texts[i], emotions[i], alphas[i], positions[i]).
+    """
+    texts: List[str] = field(default_factory=list)
+    emotions: List[Emotion] = field(default_factory=list)
+    alphas: array = field(default_factory=lambda: array('d'))
+    positions: array = field(default_factory=lambda: array('i'))
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __iter__(self):
+        """Iterate over (text, emotion, alpha, position) tuples"""
+        return zip(self.texts, self.emotions, self.alphas, self.positions)
+
+    def to_dicts(self) -> List[Dict]:
+        """Segments as dictionaries with 'text', 'emotion', 'alpha', and 'position' keys"""
+        return [
+            {'text': text, 'emotion': emotion, 'alpha': alpha, 'position': position}
+            for text, emotion, alpha, position in self
+        ]
+
 
 class EmotionTagParser:
     """Parse and process emotion tags in text"""
 
     # Supported emotions and their mappings
-    EMOTION_MAPPING = {
-        'happy': 'happy',
-        'happiness': 'happy',
-        'joy': 'happy',
-        'excited': 'happy',
-
-        'sad': 'sad',
-        'sadness': 'sad',
-        'melancholy': 'melancholic',
-        'melancholic': 'melancholic',
-        'depressed': 'melancholic',
-
-        'angry': 'angry',
-        'anger': 'angry',
-        'rage': 'angry',
-        'fury': 'angry',
-
-        'afraid': 'afraid',
-        'fear': 'afraid',
-        'scared': 'afraid',
-        'terrified': 'afraid',
-
-        'disgusted': 'disgusted',
-        'disgust': 'disgusted',
-        'revolted': 'disgusted',
-
-        'surprised': 'surprised',
-        'surprise': 'surprised',
-        'amazed': 'surprised',
-        'shocked': 'surprised',
-
-        'calm': 'calm',
-        'neutral': 'calm',
-        'normal': 'calm',
-        'peaceful': 'calm',
-
-        # Chinese mappings
-        '高兴': 'happy',
-        '快乐': 'happy',
-        '愤怒': 'angry',
-        '生气': 'angry',
-        '悲伤': 'sad',
-        '难过': 'sad',
-        '恐惧': 'afraid',
-        '害怕': 'afraid',
-        '反感': 'disgusted',
-        '厌恶': 'disgusted',
-        '低落': 'melancholic',
-        '忧郁': 'melancholic',
-        '惊讶': 'surprised',
-        '吃惊': 'surprised',
-        '自然': 'calm',
-        '平静': 'calm',
-    }
+    EMOTION_MAPPING = _EMOTION_MAPPING
 
     def __init__(self, default_emotion: str = 'calm'):
-        self.default_emotion = default_emotion
+        self.default_emotion = Emotion.from_name(default_emotion)
 
-    def parse_emotion_tags(self, text: str) -> List[Dict]:
+    def parse_emotion_tags(self, text: str) -> ParsedSegments:
         """
         Parse text with emotion tags and return segments with emotions.
 
@@ -116,105 +241,110 @@ class EmotionTagParser:
             text: Input text with emotion tags like [happy:0.8], [sad:0.5], etc.
 
         Returns:
-            List of dictionaries with 'text', 'emotion', 'alpha', and 'position' keys
+            ParsedSegments with the text, emotion, alpha, and position of each segment
         """
-        # Pattern to match emotion tags: [emotion_name:alpha] or [emotion_name]
-        tag_pattern = r'\[([^\]]+)\]'
+        matches = list(_COMBINED_RE.finditer(text))
+        if _HAS_NUMBA and len(matches) >= _JIT_MIN_TAGS:
+            return self._parse_tag_matches_jit(text, matches)
 
-        segments = []
+        parsed = ParsedSegments()
+        texts, emotions, alphas, positions = parsed.texts, parsed.emotions, parsed.alphas, parsed.positions
         current_pos = 0
         current_emotion = self.default_emotion
         current_alpha = 1.0  # Default alpha if not specified
-
-        # Find all emotion tags and their positions
-        matches = list(re.finditer(tag_pattern, text))
-
-        if not matches:
-            # No emotion tags found, use default emotion and alpha
-            return [{
-                'text': text.strip(),
-                'emotion': current_emotion,
-                'alpha': current_alpha,
-                'position': 0
-            }]
-
-        # Process text between tags
-        for i, match in enumerate(matches):
-            tag_content = match.group(1).lower().strip()
-
-            # Parse emotion and alpha from tag content
-            if ':' in tag_content:
-                emotion_part, alpha_part = tag_content.split(':', 1)
-                emotion_name = emotion_part.strip()
-                try:
-                    alpha_value = float(alpha_part.strip())
-                    # Clamp alpha between 0.0 and 1.0
-                    alpha_value = max(0.0, min(1.0, alpha_value))
-                except ValueError:
-                    alpha_value = 1.0  # Default if parsing fails
-            else:
-                emotion_name = tag_content
-                alpha_value = 1.0
-
-            # Map emotion tag to supported emotion
-            emotion = self.EMOTION_MAPPING.get(emotion_name, self.default_emotion)
-
-            # Extract text before this tag
-            if current_pos < match.start():
-                segment_text = text[current_pos:match.start()].strip()
-                if segment_text:  # Only add non-empty segments
-                    segments.append({
-                        'text': segment_text,
-                        'emotion': current_emotion,
-                        'alpha': current_alpha,
-                        'position': current_pos
-                    })
-
-            # Update current emotion and alpha
-            current_emotion = emotion
-            current_alpha = alpha_value
+        default_emotion = self.default_emotion
+        emo_get = _EMO_GET
+
+        for match in matches:
+            # Extract text before this tag, only non-empty segments are kept
+            start = match.start()
+            if current_pos < start:
+                segment_text = text[current_pos:start].strip()
+                if segment_text:
+                    texts.append(segment_text)
+                    emotions.append(current_emotion)
+                    alphas.append(current_alpha)
+                    positions.append(current_pos)
+
+            emo, alpha = match['emo'], match['alpha']
+            if emo is None:
+                emo, alpha = match['emo2'], match['alpha2']
+
+            # Map emotion tag to supported emotion, clamp alpha between 0.0 and 1.0
+            current_emotion = emo_get(emo.casefold(), default_emotion)
+            current_alpha = _tag_alpha(alpha)
             current_pos = match.end()
 
-        # Add remaining text after last tag
-        if current_pos < len(text):
+        if current_pos == 0:
+            # No emotion tags found, use default emotion and alpha
+            texts.append(text.strip())
+            emotions.append(current_emotion)
+            alphas.append(current_alpha)
+            positions.append(0)
+        elif current_pos < len(text):
+            # Add remaining text after last tag
             remaining_text = text[current_pos:].strip()
             if remaining_text:
-                segments.append({
-                    'text': remaining_text,
-                    'emotion': current_emotion,
-                    'alpha': current_alpha,
-                    'position': current_pos
-                })
+                texts.append(remaining_text)
+                emotions.append(current_emotion)
+                alphas.append(current_alpha)
+                positions.append(current_pos)
 
-        return segments
+        return parsed
 
-    def emotion_to_vector(self, emotion: str) -> List[float]:
+    def _parse_tag_matches_jit(self, text: str, matches: list) -> ParsedSegments:
         """
-        Convert emotion name to 8-dimensional emotion vector.
-        Order: [happy, angry, sad, afraid, disgusted, melancholic, surprised, calm]
+        parse_emotion_tags for long scripts: the text between tags is stripped by the
+        compiled _strip_spans kernel, and only non-empty segments are sliced out of the text.
         """
-        emotion_vectors = {
-            'happy': [1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
-            'angry': [0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
-            'sad': [0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0],
-            'afraid': [0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0],
-            'disgusted': [0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0],
-            'melancholic': [0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0],
-            'surprised': [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0],
-            'calm': [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0],
-        }
+        default_emotion = self.default_emotion
+        emo_get = _EMO_GET
+        n = len(matches)
+
+        # Gap i is the text before tag i, spoken with the emotion of tag i - 1
+        spans = np.fromiter((pos for match in matches for pos in match.span()), np.int64, 2 * n)
+        gap_starts = np.concatenate(([0], spans[1::2]))
+        gap_ends = np.concatenate((spans[0::2], [len(text)]))
+        gap_emotions = [default_emotion]
+        gap_alphas = [1.0]
+        for match in matches:
+            emo, alpha = match['emo'], match['alpha']
+            if emo is None:
+                emo, alpha = match['emo2'], match['alpha2']
+            gap_emotions.append(emo_get(emo.casefold(), default_emotion))
+            gap_alphas.append(_tag_alpha(alpha))
+
+        codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        seg_starts, seg_ends = _strip_spans(codepoints, gap_starts, gap_ends)
+
+        # Only non-empty segments are materialized
+        keep = np.flatnonzero(seg_ends > seg_starts)
+        parsed = ParsedSegments(
+            texts=[text[start:end] for start, end in zip(seg_starts[keep].tolist(), seg_ends[keep].tolist())],
+            emotions=[gap_emotions[i] for i in keep.tolist()],
+            alphas=array('d', [gap_alphas[i] for i in keep.tolist()]),
+            positions=array('i', gap_starts[keep].tolist())
+        )
+        return parsed
 
-        return emotion_vectors.get(emotion, emotion_vectors['calm'])
+    def emotion_to_vector(self, emotion) -> np.ndarray:
+        """
+        Convert an Emotion (or emotion name) to its read-only 8-dimensional emotion vector.
+        Order: [happy, angry, sad, afraid, disgusted, melancholic, surprised, calm]
+        """
+        return _EMO_BASIS_NP[Emotion.from_name(emotion)]
 
 
 class TextSegmenter:
     """Segment long text into manageable chunks for TTS processing"""
 
+    _SENTENCE_TERMINATORS = frozenset('.!?。！？')
+
     def __init__(self, max_chars: int = 200, min_chars: int = 50):
         self.max_chars = max_chars
         self.min_chars = min_chars
 
-    def segment_text(self, text: str, emotion: str, alpha: float = 1.0) -> List[Dict]:
+    def segment_text(self, text: str, emotion: Emotion, alpha: float = 1.0) -> List[Dict]:
         """
         Segment text into chunks suitable for TTS processing.
 
@@ -236,51 +366,69 @@ class TextSegmenter:
             }]
 
         segments = []
-
-        # Split by sentence boundaries first
-        sentences = re.split(r'(?<=[.!?。！？])\s+', text)
-
-        current_segment = ""
-        start_char = 0
-
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-
-            # If adding this sentence exceeds max length and current segment is not empty
-            if len(current_segment) + len(sentence) + 1 > self.max_chars and current_segment:
-                # Save current segment
+        max_chars = self.max_chars
+        seg_start = seg_end = -1
+
+        # Group whole sentences into segments, only slicing the text when a segment is flushed
+        for start, end in self._iter_sentences(text):
+            if seg_start < 0:
+                seg_start = start
+            elif end - seg_start > max_chars:
                 segments.append({
-                    'text': current_segment.strip(),
+                    'text': text[seg_start:seg_end],
                     'emotion': emotion,
                     'alpha': alpha,
-                    'start_char': start_char,
-                    'end_char': start_char + len(current_segment.strip())
+                    'start_char': seg_start,
+                    'end_char': seg_end
                 })
-
-                # Start new segment
-                current_segment = sentence
-                start_char += len(current_segment.strip()) + 1  # +1 for space
-            else:
-                # Add to current segment
-                if current_segment:
-                    current_segment += " " + sentence
-                else:
-                    current_segment = sentence
+                seg_start = start
+            seg_end = end
 
         # Add remaining segment
-        if current_segment:
+        if seg_start >= 0:
             segments.append({
-                'text': current_segment.strip(),
+                'text': text[seg_start:seg_end],
                 'emotion': emotion,
                 'alpha': alpha,
-                'start_char': start_char,
-                'end_char': start_char + len(current_segment.strip())
+                'start_char': seg_start,
+                'end_char': seg_end
             })
 
         return segments
 
+    @classmethod
+    def _iter_sentences(cls, text: str):
+        """
+        Yield (start, end) offsets of sentences in a single pass over the text.
+
+        A sentence ends at a terminator character followed by whitespace; the
+        offsets exclude surrounding whitespace.
+        """
+        terminators = cls._SENTENCE_TERMINATORS
+        start = end = -1
+        after_terminator = False
+
+        for i, ch in enumerate(text):
+            if ch.isspace():
+                if after_terminator:
+                    yield start, end
+                    start = -1
+                    after_terminator = False
+            else:
+                if start < 0:
+                    start = i
+                end = i + 1
+                after_terminator = ch in terminators
+
+        if start >= 0:
+            yield start, end
+
+
+# IndexTTS2 instance shared by all generators in the process, and the settings it was loaded with
+_TTS_SINGLETON: Optional[IndexTTS2] = None
+_TTS_KEY: Optional[Tuple] = None
+_TTS_LOCK = threading.Lock()
+
 
 class LongTextEmotionGenerator:
     """Main class for long text generation with emotion tags"""
@@ -293,7 +441,8 @@ class LongTextEmotionGenerator:
                  use_cuda_kernel: bool = False,
                  use_deepspeed: bool = False,
                  default_emo_alpha: float = 0.8,
-                 segment_max_chars: int = 200):
+                 segment_max_chars: int = 200,
+                 batch_size: int = 4):
         """
         Initialize the long text emotion generator.
 
@@ -306,46 +455,146 @@ class LongTextEmotionGenerator:
             use_deepspeed: Use DeepSpeed acceleration
             default_emo_alpha: Default emotion intensity (0.0-1.0) when not specified in tags
             segment_max_chars: Maximum characters per segment
+            batch_size: Maximum segments per batched inference call (1 disables batching)
         """
         self.voice_prompt_path = voice_prompt_path
         self.default_emo_alpha = default_emo_alpha
-
-        # Initialize IndexTTS2
-        print("Loading IndexTTS2 model...")
-        self.tts = IndexTTS2(
-            cfg_path=config_path,
-            model_dir=model_dir,
+        self.batch_size = batch_size
+
+        # Global PyTorch performance knobs, set before the model allocates anything.
+        # Segments have variable lengths, so expandable segments reduce allocator fragmentation.
+        # cudnn.benchmark is left off: it would re-tune kernels for every new segment length.
+        os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+
+        # Initialize IndexTTS2, shared with other generators using the same model settings
+        self.tts = self.get_or_load_tts(
+            config_path,
+            model_dir,
             use_fp16=use_fp16,
             use_cuda_kernel=use_cuda_kernel,
             use_deepspeed=use_deepspeed
         )
 
+        # Encode the voice prompt once; it never changes within a run
+        self._spk_cond = self.tts.encode_speaker_prompt(self.voice_prompt_path)
+        # One-hot emotion vectors, one row per emotion, already on the model device
+        self._emo_basis = torch.eye(
+            len(Emotion),
+            dtype=self.tts.dtype or torch.float32,
+            device=self.tts.device
+        )
+        # (source_sr, target_sr) -> Resample module, so resampling kernels are built once
+        self._resamplers: Dict[Tuple[int, int], torchaudio.transforms.Resample] = {}
+
         # Initialize helper classes
         self.emotion_parser = EmotionTagParser()
         self.text_segmenter = TextSegmenter(max_chars=segment_max_chars)
 
-        # Create temporary directory for intermediate files
-        self.temp_dir = tempfile.mkdtemp(prefix="indextts_long_text_")
+        # Optional torch.compile, enabled with TTS_COMPILE=1
+        if os.getenv("TTS_COMPILE", "0").lower() in ("1", "true", "yes"):
+            self._compile_models(os.getenv("TTS_COMPILE_MODE", "default"))
+
+    @classmethod
+    def get_or_load_tts(cls,
+                        config_path: str,
+                        model_dir: str,
+                        use_fp16: bool = True,
+                        use_cuda_kernel: bool = False,
+                        use_deepspeed: bool = False) -> IndexTTS2:
+        """
+        Return the process-wide IndexTTS2 instance, loading it on first use or when
+        it was loaded with different settings.
 
-    def __del__(self):
-        """Clean up temporary files"""
-        try:
-            shutil.rmtree(self.temp_dir)
-        except:
-            pass
+        The shared slot holds a single model: loading with different settings replaces
+        it, so later generators no longer share the old instance. Generators created
+        before keep their own reference, and with it the old model, until they are released.
+        """
+        global _TTS_SINGLETON, _TTS_KEY
+        key = (os.path.abspath(config_path), os.path.abspath(model_dir), use_fp16, use_cuda_kernel, use_deepspeed)
+        with _TTS_LOCK:
+            if _TTS_SINGLETON is None or _TTS_KEY != key:
+                # Release the slot's reference before loading, so the old model's GPU memory
+                # can be freed first; it is only freed if no earlier generator still holds it
+                _TTS_SINGLETON = None
+                print("Loading IndexTTS2 model...")
+                _TTS_SINGLETON = IndexTTS2(
+                    cfg_path=config_path,
+                    model_dir=model_dir,
+                    use_fp16=use_fp16,
+                    use_cuda_kernel=use_cuda_kernel,
+                    use_deepspeed=use_deepspeed
+                )
+                _TTS_KEY = key
+            return _TTS_SINGLETON
+
+    def _compile_models(self, mode: str):
+        """
+        Compile the models and run a short warmup segment, so compilation happens
+        before the real workload starts.
+
+        The GPT-2 decoder stack is compiled inside the inference model that generate()
+        steps through once per mel token, so the autoregressive loop runs compiled code.
+        torch.compile(gpt) alone would only cover UnifiedVoice.forward (the latent pass
+        in _codes_to_wav): inference_speech() is a plain method and stays eager.
+        BigVGAN is compiled as well. Segment lengths vary and the KV cache grows every
+        step, so everything is compiled with dynamic shapes; "default" or
+        "max-autotune-no-cudagraphs" suit this, as CUDA graphs would be recorded again
+        for every new length.
+        """
+        if hasattr(self.tts.gpt, "_orig_mod"):
+            # Shared model already compiled by another generator
+            return
+
+        print(f"Compiling IndexTTS2 models (mode={mode})...")
+        inference_model = self.tts.gpt.inference_model
+        if getattr(self.tts.gpt, "ds_engine", None) is None:
+            # DeepSpeed replaces the decoder with its own fused kernels
+            inference_model.transformer = torch.compile(
+                inference_model.transformer, mode=mode, dynamic=True, fullgraph=False)
+        self.tts.gpt = torch.compile(self.tts.gpt, mode=mode, dynamic=True, fullgraph=False)
+        self.tts.bigvgan = torch.compile(self.tts.bigvgan, mode=mode, dynamic=True, fullgraph=False)
+
+        with torch.no_grad():
+            self.tts.infer(
+                spk_audio_prompt=None,
+                spk_cond=self._spk_cond,
+                text="a.",
+                output_path=None,
+                emo_vector=self._emotion_vector(Emotion.CALM),
+                emo_alpha=0.5,
+                verbose=False,
+                return_tensor=True
+            )
 
-    def generate_segments(self, segments: List[Dict]) -> List[str]:
+    def _resample(self, waveform: torch.Tensor, source_sr: int, target_sr: int) -> torch.Tensor:
+        """Resample a waveform with a cached Resample module, keeping its dtype"""
+        key = (source_sr, target_sr)
+        resampler = self._resamplers.get(key)
+        if resampler is None:
+            resampler = self._resamplers[key] = torchaudio.transforms.Resample(source_sr, target_sr)
+        resampled = resampler(waveform.float())
+        if waveform.dtype.is_floating_point:
+            return resampled.to(waveform.dtype)
+        # Sinc overshoot on near full scale audio would wrap around in the integer cast
+        limits = torch.iinfo(waveform.dtype)
+        return resampled.round_().clamp_(limits.min, limits.max).to(waveform.dtype)
+
+    def _emotion_vector(self, emotion: Emotion) -> torch.Tensor:
+        """Get the emotion vector for an emotion as a view into the device basis"""
+        return self._emo_basis[Emotion.from_name(emotion)]
+
+    def generate_segments(self, segments: List[Dict]) -> Iterator[Tuple[torch.Tensor, int]]:
         """
-        Generate audio for all segments.
+        Generate audio for all segments, lazily as the result is consumed.
 
         Args:
             segments: List of segment dictionaries with 'text', 'emotion', and 'alpha'
 
-        Returns:
-            List of paths to generated audio files
+        Yields:
+            (waveform, sample_rate) tuples, waveforms are int16 [1, N] tensors
         """
-        audio_files = []
-
         print(f"Generating {len(segments)} audio segments...")
 
         for i, segment in enumerate(segments):
@@ -353,82 +602,115 @@ class LongTextEmotionGenerator:
             print(f"  Segment {i+1}/{len(segments)}: [{segment['emotion']}] (α={alpha:.2f}) '{segment['text'][:50]}...'")
 
             # Convert emotion to vector
-            emo_vector = self.emotion_parser.emotion_to_vector(segment['emotion'])
-
-            # Generate output path
-            output_path = os.path.join(self.temp_dir, f"segment_{i:03d}.wav")
+            emo_vector = self._emotion_vector(segment['emotion'])
 
             try:
-                # Generate audio for this segment
-                self.tts.infer(
-                    spk_audio_prompt=self.voice_prompt_path,
+                # Generate audio for this segment, kept in memory
+                yield self.tts.infer(
+                    spk_audio_prompt=None,
+                    spk_cond=self._spk_cond,
                     text=segment['text'],
-                    output_path=output_path,
+                    output_path=None,
                     emo_vector=emo_vector,
                     emo_alpha=alpha,  # Use per-segment alpha
                     use_random=False,
-                    verbose=False
+                    verbose=False,
+                    return_tensor=True
                 )
 
-                if os.path.exists(output_path):
-                    audio_files.append(output_path)
-                else:
-                    print(f"Warning: Failed to generate audio for segment {i+1}")
-
             except Exception as e:
                 print(f"Error generating segment {i+1}: {e}")
                 continue
 
-        return audio_files
+    def generate_segments_batched(self, segments: List[Dict]) -> Iterator[Tuple[torch.Tensor, int]]:
+        """
+        Generate audio for all segments, batching consecutive segments that share
+        the same emotion and alpha into a single inference call.
+
+        Args:
+            segments: List of segment dictionaries with 'text', 'emotion', and 'alpha'
 
-    def concatenate_audio(self, audio_files: List[str], output_path: str) -> bool:
+        Yields:
+            (waveform, sample_rate) tuples, in segment order
         """
-        Concatenate multiple audio files into a single file.
+        print(f"Generating {len(segments)} audio segments (batch size {self.batch_size})...")
+
+        def batch_key(item):
+            # Exact alpha, so each segment is synthesized with the same alpha as unbatched
+            # (segments split from one tag share it anyway)
+            segment = item[1]
+            return segment['emotion'], segment.get('alpha', self.default_emo_alpha)
+
+        for (emotion, alpha), group in groupby(enumerate(segments), key=batch_key):
+            group = list(group)
+            for start in range(0, len(group), self.batch_size):
+                batch = group[start:start + self.batch_size]
+                first, last = batch[0][0] + 1, batch[-1][0] + 1
+                print(f"  Segments {first}-{last}/{len(segments)}: [{emotion}] (α={alpha:.2f})")
+
+                try:
+                    batch_audio = self.tts.infer_batch(
+                        spk_audio_prompt=None,
+                        spk_cond=self._spk_cond,
+                        texts=[segment['text'] for _, segment in batch],
+                        emo_vector=self._emotion_vector(emotion),
+                        emo_alpha=alpha,
+                        use_random=False,
+                        verbose=False,
+                        max_batch_size=self.batch_size,
+                        return_tensor=True
+                    )
+
+                except Exception as e:
+                    print(f"Error generating segments {first}-{last}: {e}")
+                    continue
+
+                yield from batch_audio
+
+    def concatenate_audio(self, audio_segments: Iterable[Tuple[torch.Tensor, int]], output_path: str) -> bool:
+        """
+        Write audio segments to a single file as they arrive, so only one segment
+        is held in memory at a time.
 
         Args:
-            audio_files: List of paths to audio files
+            audio_segments: Iterable of (waveform, sample_rate) tuples, e.g. from generate_segments()
             output_path: Path for output audio file
 
         Returns:
             True if successful, False otherwise
         """
-        if not audio_files:
-            print("No audio files to concatenate")
-            return False
+        writer = None
+        num_segments = 0
 
         try:
-            # Load all audio files and concatenate
-            audio_data = []
-            sample_rate = None
-
-            for audio_file in audio_files:
-                if os.path.exists(audio_file):
-                    # Load audio
-                    waveform, sr = torchaudio.load(audio_file)
-                    if sample_rate is None:
-                        sample_rate = sr
-                    elif sr != sample_rate:
-                        # Resample if needed
-                        waveform = torchaudio.transforms.Resample(sr, sample_rate)(waveform)
-
-                    audio_data.append(waveform)
-
-            if not audio_data:
-                print("No valid audio data found")
-                return False
-
-            # Concatenate all audio
-            concatenated = torch.cat(audio_data, dim=1)
-
-            # Save output
-            torchaudio.save(output_path, concatenated, sample_rate)
-            print(f"Successfully concatenated {len(audio_files)} segments to: {output_path}")
-            return True
+            for waveform, sr in audio_segments:
+                if writer is None:
+                    # The first segment fixes the output sample rate and channel count
+                    sample_rate = sr
+                    writer = sf.SoundFile(output_path, mode='w', samplerate=sample_rate,
+                                          channels=waveform.size(0), subtype='PCM_16')
+                elif sr != sample_rate:
+                    # Resample if needed
+                    waveform = self._resample(waveform, sr, sample_rate)
+
+                writer.write(waveform.t().numpy())
+                num_segments += 1
 
         except Exception as e:
-            print(f"Error concatenating audio: {e}")
+            print(f"Error writing audio: {e}")
+            return False
+
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if not num_segments:
+            print("No audio segments were generated")
             return False
 
+        print(f"Successfully wrote {num_segments} segments to: {output_path}")
+        return True
+
     def generate_from_text(self, text: str, output_path: str) -> bool:
         """
         Generate long-form speech from text with emotion tags.
@@ -448,19 +730,13 @@ class LongTextEmotionGenerator:
             return False
 
         print(f"Found {len(emotion_segments)} emotion segments:")
-        for i, segment in enumerate(emotion_segments):
-            alpha = segment.get('alpha', self.default_emo_alpha)
-            print(f"  {i+1}: [{segment['emotion']}] (α={alpha:.2f}) {segment['text'][:50]}...")
+        for i, (segment_text, emotion, alpha, _) in enumerate(emotion_segments):
+            print(f"  {i+1}: [{emotion}] (α={alpha:.2f}) {segment_text[:50]}...")
 
         # Further segment long emotion segments
         all_segments = []
-        for emotion_segment in emotion_segments:
-            text_segments = self.text_segmenter.segment_text(
-                emotion_segment['text'],
-                emotion_segment['emotion'],
-                emotion_segment.get('alpha', self.default_emo_alpha)
-            )
-            all_segments.extend(text_segments)
+        for segment_text, emotion, alpha, _ in emotion_segments:
+            all_segments.extend(self.text_segmenter.segment_text(segment_text, emotion, alpha))
 
         print(f"Total segments after text segmentation: {len(all_segments)}")
 
@@ -470,15 +746,13 @@ class LongTextEmotionGenerator:
                 alpha = segment.get('alpha', self.default_emo_alpha)
                 print(f"  Final segment {i+1}: [{segment['emotion']}] (α={alpha:.2f}) '{segment['text'][:40]}...'")
 
-        # Generate audio for all segments
-        audio_files = self.generate_segments(all_segments)
-
-        if not audio_files:
-            print("No audio segments were generated")
-            return False
+        # Generate audio for all segments, streamed into the output file
+        if self.batch_size > 1:
+            audio_segments = self.generate_segments_batched(all_segments)
+        else:
+            audio_segments = self.generate_segments(all_segments)
 
-        # Concatenate all segments
-        return self.concatenate_audio(audio_files, output_path)
+        return self.concatenate_audio(audio_segments, output_path)
 
     def generate_from_file(self, input_file: str, output_path: str) -> bool:
         """
@@ -579,6 +853,13 @@ Alpha values (0.0-1.0) control emotion intensity for each tag.
         help="Maximum characters per segment (default: 200)"
     )
 
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=4,
+        help="Maximum segments per batched inference call, 1 disables batching (default: 4)"
+    )
+
     parser.add_argument(
         "--fp16",
         action="store_true",
@@ -643,7 +924,8 @@ Alpha values (0.0-1.0) control emotion intensity for each tag.
             use_cuda_kernel=args.cuda_kernel,
             use_deepspeed=args.deepspeed,
             default_emo_alpha=args.default_emo_alpha,
-            segment_max_chars=args.segment_chars
+            segment_max_chars=args.segment_chars,
+            batch_size=args.batch_size
         )
 
         # Generate audio
@@ -655,13 +937,10 @@ Alpha values (0.0-1.0) control emotion intensity for each tag.
         if success:
             print(f"\nSuccessfully generated long-form speech: {args.output}")
             if args.verbose:
-                # Get file info
-                if os.path.exists(args.output):
-                    import soundfile as sf
-                    data, sr = sf.read(args.output)
-                    duration = len(data) / sr
-                    print(f"Audio duration: {duration:.2f} seconds")
-                    print(f"Sample rate: {sr} Hz")
+                # Get file info from the header of the file we just wrote
+                info = sf.info(args.output)
+                print(f"Audio duration: {info.duration:.2f} seconds")
+                print(f"Sample rate: {info.samplerate} Hz")
         else:
             print("\nFailed to generate audio")
             sys.exit(1)
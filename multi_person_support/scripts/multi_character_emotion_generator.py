@@ -27,22 +27,27 @@ import re
 import sys
 import argparse
 import json
-from typing import List, Dict, Tuple, Optional, NamedTuple, Union
-import tempfile
-import shutil
+import queue
+import threading
+from functools import lru_cache
+from collections import OrderedDict
+from typing import List, Dict, Tuple, Optional, NamedTuple, Union, Iterable, Iterator
 from pathlib import Path
-from dataclasses import dataclass
-import copy
+from types import MappingProxyType
+from dataclasses import dataclass, replace
 
 # Add current directory to path for IndexTTS imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 sys.path.append(os.path.join(current_dir, "indextts"))
 
+from _config_utils import resolve_config_source
+
 try:
     from indextts.infer_v2 import IndexTTS2
     import torch
     import torchaudio
+    import soundfile as sf
     import librosa
     import numpy as np
 except ImportError as e:
@@ -50,8 +55,28 @@ except ImportError as e:
     print("Please ensure IndexTTS2 is properly installed with 'uv sync --all-extras'")
     sys.exit(1)
 
+# orjson parses large scripts and configs several times faster; stdlib json is the fallback.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-@dataclass
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    # Without numba _split_long_segment always splits sentences with the regex
+    _HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@dataclass(slots=True)
 class CharacterConfig:
     """Character configuration with voice and emotion parameters"""
     name: str
@@ -64,7 +89,7 @@ class CharacterConfig:
     description: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class DialogueSegment:
     """Dialogue segment with character and emotion information"""
     text: str
@@ -76,11 +101,190 @@ class DialogueSegment:
     emo_text: Optional[str] = None  # For descriptive emotion text
 
 
+@dataclass
+class ParsedScript:
+    """
+    Dialogue segments stored as parallel columns, for vectorized batch shaping.
+    Segment i is (texts[i], characters[i], emotions[i], alphas[i], is_dialogue[i], positions[i], emo_texts[i]).
+    """
+    texts: List[str]
+    characters: np.ndarray  # object
+    emotions: np.ndarray  # object
+    alphas: np.ndarray  # float64
+    is_dialogue: np.ndarray  # bool
+    positions: np.ndarray  # int64
+    emo_texts: np.ndarray  # object, None for segments without descriptive emotion text
+
+    @classmethod
+    def from_segments(cls, segments: List[DialogueSegment]) -> "ParsedScript":
+        """Build the columns from a list of segments"""
+        def column(values, dtype):
+            out = np.empty(len(segments), dtype=dtype)
+            out[:] = values
+            return out
+
+        return cls(
+            texts=[segment.text for segment in segments],
+            characters=column([segment.character for segment in segments], object),
+            emotions=column([segment.emotion for segment in segments], object),
+            alphas=column([segment.alpha for segment in segments], np.float64),
+            is_dialogue=column([segment.is_dialogue for segment in segments], bool),
+            positions=column([segment.position for segment in segments], np.int64),
+            emo_texts=column([segment.emo_text for segment in segments], object),
+        )
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @staticmethod
+    def run_starts(*columns: np.ndarray) -> np.ndarray:
+        """Start index of every run of consecutive rows that are equal in all columns"""
+        n = len(columns[0])
+        if n == 0:
+            return np.empty(0, dtype=np.int64)
+        changed = np.zeros(n - 1, dtype=bool)
+        for col in columns:
+            changed |= col[1:] != col[:-1]
+        return np.concatenate(([0], np.flatnonzero(changed) + 1))
+
+
+def _adjust_alpha(alpha, is_dialogue):
+    """
+    Emotion alpha for dialogue vs narration, for a scalar or elementwise on arrays.
+    For very low alpha values (<= 0.1) use no emotion to avoid affecting speech rate;
+    dialogue has stronger emotion expression, narration more subtle.
+    """
+    return np.where(alpha <= 0.1, 0.0, np.where(is_dialogue, np.minimum(1.0, alpha * 1.2), alpha * 0.8))
+
+
+# Parsed config files keyed by (abspath, mtime_ns, size), so re-creating parsers for an
+# unchanged file doesn't re-read it. The cached dicts are shared: treat them as read-only.
+_CONFIG_CACHE: Dict[Tuple[str, int, int], Dict] = {}
+
+
+def _load_config_file(config_path: str) -> Dict:
+    """Parse a JSON config file, reusing the previous result while the file is unchanged"""
+    path = os.path.abspath(config_path)
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    config = _CONFIG_CACHE.get(key)
+    if config is None:
+        config = _json_loads(Path(path).read_bytes())
+        # Drop entries for older versions of the same file
+        for stale in [k for k in _CONFIG_CACHE if k[0] == path]:
+            del _CONFIG_CACHE[stale]
+        _CONFIG_CACHE[key] = config
+    return config
+
+
+# Plain text without character tags; no emotion to avoid affecting speech rate
+_NARRATION_TEMPLATE = DialogueSegment(text='', character='narrator', emotion='calm', alpha=0.0,
+                                      is_dialogue=False, position=0)
+
+# Character tag: {[character]:[emotion:intensity]} or {[character]:[emotion:description]}
+_CHAR_TAG_RE = re.compile(r'\{\[(\w+)\]:\[(\w+):([^\]]+)\]\}')
+_CHAR_PREFIX_RE = re.compile(r'^\{\[(\w+)\]:\[(\w+):([^\]]+)\]\}')
+_CHAR_EXTRACT_RE = re.compile(r'^\{\[(\w+)\]:\[(\w+):([^\]]+)\]\}(.*)')
+
+
+def _tag_value(value: str) -> Union[float, str]:
+    """Tag value as an intensity clamped to [0, 1] if numeric, else the descriptive text"""
+    try:
+        return max(0.0, min(1.0, float(value)))
+    except ValueError:
+        return value
+
+
+# Quoted dialogue, Chinese or English quotation marks
+_QUOTES_RE = re.compile(r'(?P<cn>「[^」]*」)|(?P<en>"[^"]*")')
+
+# Emotion tag formats in one alternation: [emotion:alpha], {emotion:alpha}, <emotion:alpha>, [emotion], {emotion}, <emotion>
+_EMO_TAG_RE = re.compile(
+    r'\[(?P<e1>[^\]]+):(?P<a1>[0-9.]+)\]'
+    r'|\{(?P<e2>[^\}]+):(?P<a2>[0-9.]+)\}'
+    r'|<(?P<e3>[^>]+):(?P<a3>[0-9.]+)>'
+    r'|\[(?P<e4>[^\]]+)\]'
+    r'|\{(?P<e5>[^\}]+)\}'
+    r'|<(?P<e6>[^>]+)>'
+)
+_EMO_TAG_GROUPS = tuple((f'e{i}', f'a{i}') for i in range(1, 7))
+
+# Sentence boundaries, captured so the terminator stays with its sentence
+_SENTENCE_SPLIT_RE = re.compile(r'([。！？.!?])')
+
+# Text length from which _split_long_segment finds sentence boundaries with the numba kernel
+_JIT_MIN_CHARS = 2000
+
+
+@njit(cache=True)
+def _sentence_ends(codepoints):
+    """
+    End offset of every sentence in codepoints, matching _SENTENCE_SPLIT_RE: each of 。！？.!?
+    closes a sentence, and the last sentence (possibly empty) runs to the end of the text
+    """
+    n = codepoints.shape[0]
+    ends = np.empty(n + 1, np.int64)
+    count = 0
+    for i in range(n):
+        cp = codepoints[i]
+        if cp == 0x3002 or cp == 0xff01 or cp == 0xff1f or cp == 0x2e or cp == 0x21 or cp == 0x3f:
+            ends[count] = i + 1
+            count += 1
+    ends[count] = n
+    return ends[:count + 1]
+
+
+# Emotion names (lowercased) mapped to the emotions supported by IndexTTS2
+_EMOTION_MAP = MappingProxyType({name.lower(): emotion for name, emotion in {
+    'happy': 'happy', 'happiness': 'happy', 'joy': 'happy', 'excited': 'happy', 'content': 'happy',
+    'sad': 'sad', 'sadness': 'sad', 'longing': 'sad', 'yearning': 'sad',
+    'melancholy': 'melancholic', 'melancholic': 'melancholic', 'depressed': 'melancholic', 'nostalgic': 'melancholic',
+    'angry': 'angry', 'anger': 'angry', 'rage': 'angry', 'fury': 'angry', 'outraged': 'angry', 'furious': 'angry',
+    'afraid': 'afraid', 'fear': 'afraid', 'scared': 'afraid', 'terrified': 'afraid', 'alarmed': 'afraid',
+    'disgusted': 'disgusted', 'disgust': 'disgusted', 'revolted': 'disgusted',
+    'surprised': 'surprised', 'surprise': 'surprised', 'amazed': 'surprised', 'shocked': 'surprised',
+    'calm': 'calm', 'neutral': 'calm', 'normal': 'calm', 'peaceful': 'calm',
+    # Chinese
+    '高兴': 'happy', '快乐': 'happy', '愤怒': 'angry', '生气': 'angry',
+    '悲伤': 'sad', '难过': 'sad', '恐惧': 'afraid', '害怕': 'afraid',
+    '反感': 'disgusted', '厌恶': 'disgusted', '惊讶': 'surprised', '吃惊': 'surprised',
+    '低落': 'melancholic', '忧郁': 'melancholic', '自然': 'calm', '平静': 'calm',
+    # Additional complex emotions
+    'determined': 'angry', 'resolved': 'angry', 'courageous': 'angry',
+    'thoughtful': 'calm', 'wise': 'calm', 'serene': 'calm',
+    'reverent': 'calm', 'respectful': 'calm',
+}.items()})
+
+# Dialogue keywords per character, in priority order
+_DIALOGUE_KEYWORDS = (
+    ('ailin', ('艾琳', '我', '我们')),
+    ('commander', ('指挥官', '母舰', '基地')),
+    ('guardian', ('守护者', '保护', '平衡')),
+    ('company', ('公司', '矿业', '商业')),
+)
+_DIALOGUE_KEYWORD_RANK = MappingProxyType({
+    keyword.lower(): rank
+    for rank, (_, keywords) in enumerate(_DIALOGUE_KEYWORDS)
+    for keyword in keywords
+})
+# Longest keywords first so overlapping keywords (我/我们) resolve to the longer one
+_DIALOGUE_KEYWORD_RE = re.compile('|'.join(
+    re.escape(keyword) for keyword in sorted(_DIALOGUE_KEYWORD_RANK, key=len, reverse=True)
+))
+
+
+@lru_cache(maxsize=256)
+def _map_emotion_name(emotion_name: str) -> str:
+    """Map emotion name to supported IndexTTS2 emotions, defaulting to calm"""
+    return _EMOTION_MAP.get(emotion_name.lower(), 'calm')
+
+
 class CharacterDialogueParser:
     """Parse character dialogue and emotions from text"""
 
-    def __init__(self, config_path: str):
-        self.config = self.load_config(config_path)
+    def __init__(self, config_path: Optional[str] = None, config_dict: Optional[Dict] = None):
+        # An in-memory config (e.g. embedded in JSON input) takes precedence over the file
+        self.config = config_dict if config_dict is not None else self.load_config(config_path)
         self.characters = self._parse_characters()
         self.dialogue_patterns = self.config.get('dialogue_patterns', {})
         self.narration_settings = self.config.get('narration_settings', {})
@@ -89,8 +293,7 @@ class CharacterDialogueParser:
     def load_config(self, config_path: str) -> Dict:
         """Load character configuration from JSON file"""
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _load_config_file(config_path)
         except FileNotFoundError:
             print(f"Error: Configuration file {config_path} not found")
             sys.exit(1)
@@ -107,31 +310,23 @@ class CharacterDialogueParser:
 
     def parse_text_with_characters(self, text: str) -> List[DialogueSegment]:
         """Parse text and identify dialogue segments with characters"""
-        segments = []
-        lines = text.split('\n')
+        return list(self.iter_text_with_characters(text))
+
+    def iter_text_with_characters(self, text: str) -> Iterator[DialogueSegment]:
+        """Lazily parse text into dialogue segments with characters, in text order"""
         position = 0
 
-        for line in lines:
+        for line in text.split('\n'):
             line = line.strip()
             if not line:
                 continue
 
-            # Pattern to find all character tags and their positions: {[character]:[emotion:value]}
-            char_pattern = r'(\{\[\w+\]:\[\w+:[^\]]+\]\})'
-
-            # Find all matches with their positions
-            matches = list(re.finditer(char_pattern, line))
+            # Find all character tags {[character]:[emotion:value]} with their positions
+            matches = list(_CHAR_TAG_RE.finditer(line))
 
             # If no character tags found, treat as narration
             if not matches:
-                segments.append(DialogueSegment(
-                    text=line,
-                    character='narrator',  # Default to narrator
-                    emotion='calm',
-                    alpha=0.0,  # Use no emotion for plain text to avoid affecting speech rate
-                    is_dialogue=False,
-                    position=position
-                ))
+                yield replace(_NARRATION_TEMPLATE, text=line, position=position)
                 position += 1
                 continue
 
@@ -140,21 +335,14 @@ class CharacterDialogueParser:
             if first_match.start() > 0:
                 pre_text = line[:first_match.start()].strip()
                 if pre_text:
-                    segments.append(DialogueSegment(
-                        text=pre_text,
-                        character='narrator',
-                        emotion='calm',
-                        alpha=0.0,  # Use no emotion for plain text to avoid affecting speech rate
-                        is_dialogue=False,
-                        position=position
-                    ))
+                    yield replace(_NARRATION_TEMPLATE, text=pre_text, position=position)
                     position += 1
 
             # Process each character tag and its following text
             for i, match in enumerate(matches):
-                # Extract character info from tag
-                tag_text = match.group(1)
-                char_id, emotion, value, tag_content = self._extract_character_content(tag_text)
+                # Extract character info from the tag's own groups, no second match needed
+                char_id, emotion, value = match.group(1, 2, 3)
+                value = _tag_value(value)
 
                 # Find the text after this tag until next tag or end of line
                 start_pos = match.end()
@@ -164,80 +352,39 @@ class CharacterDialogueParser:
                 else:
                     following_text = line[start_pos:].strip()
 
-                if char_id in self.characters and following_text:
-                    # Check if value is numeric (intensity) or descriptive text
-                    if isinstance(value, str):
-                        # Descriptive emotion text
-                        segments.append(DialogueSegment(
-                            text=following_text,
-                            character=char_id,
-                            emotion=emotion,
-                            alpha=0.8,  # Default alpha for descriptive emotions
-                            is_dialogue=True,
-                            position=position,
-                            emo_text=f"{emotion}: {value}"  # Combine emotion type with description
-                        ))
-                    else:
-                        # Numeric intensity
-                        segments.append(DialogueSegment(
-                            text=following_text,
-                            character=char_id,
-                            emotion=emotion,
-                            alpha=value,
-                            is_dialogue=True,
-                            position=position
-                        ))
-                    position += 1
+                # Treat as narration if character not found or no following text
+                is_dialogue = bool(char_id in self.characters and following_text)
+                # Check if value is numeric (intensity) or descriptive text
+                if isinstance(value, str):
+                    # Combine emotion type with description, default alpha for descriptive emotions
+                    emo_text, alpha = f"{emotion}: {value}", 0.8
                 else:
-                    # Treat as narration if character not found or no following text
-                    if isinstance(value, str):
-                        segments.append(DialogueSegment(
-                            text=following_text,
-                            character='narrator',
-                            emotion=emotion,
-                            alpha=0.8,
-                            is_dialogue=False,
-                            position=position,
-                            emo_text=f"{emotion}: {value}"
-                        ))
-                    else:
-                        segments.append(DialogueSegment(
-                            text=following_text,
-                            character='narrator',
-                            emotion=emotion,
-                            alpha=value,
-                            is_dialogue=False,
-                            position=position
-                        ))
-                    position += 1
-
-        return segments
+                    emo_text, alpha = None, value
+                yield DialogueSegment(
+                    text=following_text,
+                    character=char_id if is_dialogue else 'narrator',
+                    emotion=emotion,
+                    alpha=alpha,
+                    is_dialogue=is_dialogue,
+                    position=position,
+                    emo_text=emo_text
+                )
+                position += 1
 
     def _has_character_prefix(self, line: str) -> bool:
         """Check if line has the required strict character prefix format"""
         # Accept both formats: {[character]:[emotion:intensity]} and {[character]:[emotion:description]}
-        pattern = r'^\{\[(\w+)\]:\[(\w+):([^\]]+)\]\}'
-        return bool(re.match(pattern, line))
+        return bool(_CHAR_PREFIX_RE.match(line))
 
     def _extract_character_content(self, line: str) -> Tuple[str, str, str, Union[float, str]]:
         """Extract character ID, emotion, intensity/description, and content from strict format line"""
         # Format: {[character]:[emotion:intensity]}content or {[character]:[emotion:description]}content
-        pattern = r'^\{\[(\w+)\]:\[(\w+):([^\]]+)\]\}(.*)'
-        match = re.match(pattern, line)
+        match = _CHAR_EXTRACT_RE.match(line)
         if match:
-            character = match.group(1)
-            emotion = match.group(2)
-            value = match.group(3)
-            content = match.group(4).strip()
+            character, emotion, value, content = match.group(1, 2, 3, 4)
 
             # Check if value is numeric (intensity) or descriptive text
-            try:
-                intensity = float(value)
-                intensity = max(0.0, min(1.0, intensity))
-                return character, emotion, intensity, content
-            except ValueError:
-                # Value is descriptive text
-                return character, emotion, value, content
+            return character, emotion, _tag_value(value), content.strip()
         else:
             # Return default values if line doesn't match required format
             # Use alpha 0.0 for plain text to avoid emotion processing affecting speech rate
@@ -246,110 +393,76 @@ class CharacterDialogueParser:
     def _extract_dialogue_from_text(self, line: str) -> List[Dict]:
         """Extract dialogue parts from mixed text"""
         parts = []
-        # Support both Chinese and English quotation marks
-        dialogue_pattern = r'([^\"]*)(\"[^\"]*\")([^\"]*)'
-        chinese_pattern = r'([^\「]*)(\「[^\」]*\」)([^\「]*)'
-
-        # Try Chinese quotes first
-        matches = re.findall(chinese_pattern, line)
-        if matches:
-            for match in matches:
-                if match[0].strip():
-                    parts.append({'text': match[0].strip(), 'is_dialogue': False})
-                if match[1].strip():
-                    parts.append({'text': match[1].strip('「」'), 'is_dialogue': True})
-                if match[2].strip():
-                    parts.append({'text': match[2].strip(), 'is_dialogue': False})
-        else:
-            # Try English quotes
-            matches = re.findall(dialogue_pattern, line)
-            for match in matches:
-                if match[0].strip():
-                    parts.append({'text': match[0].strip(), 'is_dialogue': False})
-                if match[1].strip():
-                    parts.append({'text': match[1].strip('"'), 'is_dialogue': True})
-                if match[2].strip():
-                    parts.append({'text': match[2].strip(), 'is_dialogue': False})
-
-        return parts if parts else [{'text': line, 'is_dialogue': False}]
+        # Support both Chinese and English quotation marks, in one pass over the line
+        last = 0
+        for match in _QUOTES_RE.finditer(line):
+            narration = line[last:match.start()].strip()
+            if narration:
+                parts.append({'text': narration, 'is_dialogue': False})
+            if match['cn'] is not None:
+                parts.append({'text': match['cn'].strip('「」'), 'is_dialogue': True})
+            else:
+                parts.append({'text': match['en'].strip('"'), 'is_dialogue': True})
+            last = match.end()
+
+        if not parts:
+            return [{'text': line, 'is_dialogue': False}]
+
+        narration = line[last:].strip()
+        if narration:
+            parts.append({'text': narration, 'is_dialogue': False})
+        return parts
 
     def _identify_dialogue_character(self, dialogue_text: str) -> str:
         """Identify character based on dialogue content and context"""
         # Simple heuristics - can be enhanced with NLP
-        text_lower = dialogue_text.lower()
-
-        if any(word in text_lower for word in ['艾琳', '我', '我们']):
-            return 'ailin'
-        elif any(word in text_lower for word in ['指挥官', '母舰', '基地']):
-            return 'commander'
-        elif any(word in text_lower for word in ['守护者', '保护', '平衡']):
-            return 'guardian'
-        elif any(word in text_lower for word in ['公司', '矿业', '商业']):
-            return 'company'
-        else:
-            return 'ailin'  # Default to main character
+        # One scan for all keywords; when several characters match, the earlier one in
+        # _DIALOGUE_KEYWORDS wins
+        best = len(_DIALOGUE_KEYWORDS)
+        for match in _DIALOGUE_KEYWORD_RE.finditer(dialogue_text.lower()):
+            best = min(best, _DIALOGUE_KEYWORD_RANK[match.group()])
+            if best == 0:
+                break
+        if best < len(_DIALOGUE_KEYWORDS):
+            return _DIALOGUE_KEYWORDS[best][0]
+        return 'ailin'  # Default to main character
 
     def _parse_emotion_tags(self, text: str) -> Tuple[str, float, str]:
         """Parse emotion tags and return emotion, alpha, and cleaned text"""
         # Support multiple tag formats: [emotion:alpha], {emotion:alpha}, <emotion:alpha>
-        tag_patterns = [
-            r'\[([^\]]+):([0-9.]+)\]',
-            r'\{([^\}]+):([0-9.]+)\}',
-            r'<([^>]+):([0-9.]+)>',
-            r'\[([^\]]+)\]',
-            r'\{([^\}]+)\}',
-            r'<([^>]+)>'
-        ]
-
-        for pattern in tag_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                last_match = matches[-1]  # Use last emotion tag
-                if len(last_match) == 2:
-                    emotion_part, alpha_part = last_match
-                    try:
-                        alpha = float(alpha_part)
-                        alpha = max(0.0, min(1.0, alpha))
-                    except ValueError:
-                        alpha = 0.8
-                else:
-                    emotion_part = last_match[0]
-                    alpha = 0.8
-
-                # Map emotion to supported values
-                emotion = self._map_emotion(emotion_part.strip())
-                # Remove tags from text
-                clean_text = re.sub(pattern, '', text).strip()
-                return emotion, alpha, clean_text
+        matches = list(_EMO_TAG_RE.finditer(text))
+        if not matches:
+            # No emotion tags found, use defaults
+            return 'calm', 0.5, text
+
+        groups = matches[-1].groupdict()  # Use last emotion tag
+        emotion_part, alpha_part = next(
+            (groups[emo_key], groups.get(alpha_key))
+            for emo_key, alpha_key in _EMO_TAG_GROUPS
+            if groups[emo_key] is not None
+        )
+        alpha = 0.8
+        if alpha_part is not None:
+            try:
+                alpha = max(0.0, min(1.0, float(alpha_part)))
+            except ValueError:
+                pass
 
-        # No emotion tags found, use defaults
-        return 'calm', 0.5, text
+        # Map emotion to supported values
+        emotion = self._map_emotion(emotion_part.strip())
+        # Remove tags from text, slicing around the spans already found
+        parts = []
+        last = 0
+        for match in matches:
+            parts.append(text[last:match.start()])
+            last = match.end()
+        parts.append(text[last:])
+        clean_text = ''.join(parts).strip()
+        return emotion, alpha, clean_text
 
     def _map_emotion(self, emotion_name: str) -> str:
         """Map emotion name to supported IndexTTS2 emotions"""
-        emotion_mapping = {
-            'happy': 'happy', 'happiness': 'happy', 'joy': 'happy', 'excited': 'happy',
-            'sad': 'sad', 'sadness': 'sad', 'melancholy': 'melancholic', 'melancholic': 'melancholic', 'depressed': 'melancholic',
-            'angry': 'angry', 'anger': 'angry', 'rage': 'angry', 'fury': 'angry',
-            'afraid': 'afraid', 'fear': 'afraid', 'scared': 'afraid', 'terrified': 'afraid',
-            'disgusted': 'disgusted', 'disgust': 'disgusted', 'revolted': 'disgusted',
-            'surprised': 'surprised', 'surprise': 'surprised', 'amazed': 'surprised', 'shocked': 'surprised',
-            'calm': 'calm', 'neutral': 'calm', 'normal': 'calm', 'peaceful': 'calm',
-            # Chinese
-            '高兴': 'happy', '快乐': 'happy', '愤怒': 'angry', '生气': 'angry',
-            '悲伤': 'sad', '难过': 'sad', '恐惧': 'afraid', '害怕': 'afraid',
-            '反感': 'disgusted', '厌恶': 'disgusted', '惊讶': 'surprised', '吃惊': 'surprised',
-            '低落': 'melancholic', '忧郁': 'melancholic', '自然': 'calm', '平静': 'calm',
-            # Additional complex emotions
-            'determined': 'angry', 'resolved': 'angry', 'courageous': 'angry',
-            'thoughtful': 'calm', 'wise': 'calm', 'serene': 'calm',
-            'alarmed': 'afraid', 'shocked': 'surprised', 'amazed': 'surprised',
-            'outraged': 'angry', 'furious': 'angry', 'disgusted': 'disgusted',
-            'reverent': 'calm', 'respectful': 'calm', 'content': 'happy',
-            'nostalgic': 'melancholic', 'longing': 'sad', 'yearning': 'sad'
-        }
-
-        return emotion_mapping.get(emotion_name.lower(), 'calm')
+        return _map_emotion_name(emotion_name)
 
 
 class TextSegmenter:
@@ -359,79 +472,155 @@ class TextSegmenter:
         self.max_chars = max_chars
         self.overlap_chars = overlap_chars
 
-    def segment_dialogue(self, segments: List[DialogueSegment]) -> List[DialogueSegment]:
+    def segment_dialogue(self, segments: Iterable[DialogueSegment]) -> List[DialogueSegment]:
         """Segment dialogue while preserving character and emotion information"""
-        segmented = []
+        return list(self.iter_segmented_dialogue(segments))
 
+    def iter_segmented_dialogue(self, segments: Iterable[DialogueSegment]) -> Iterator[DialogueSegment]:
+        """Lazily segment dialogue, yielding segments short enough for TTS in order"""
         for segment in segments:
             if len(segment.text) <= self.max_chars:
-                segmented.append(segment)
+                yield segment
             else:
                 # Split long segments
-                sub_segments = self._split_long_segment(segment)
-                segmented.extend(sub_segments)
+                yield from self._split_long_segment(segment)
+
+    @staticmethod
+    def _iter_sentences(text: str) -> Iterator[str]:
+        """Split text into sentences, each keeping its terminator"""
+        if _HAS_NUMBA and len(text) >= _JIT_MIN_CHARS:
+            # UTF-32 code units are the str indices, so the offsets slice text directly
+            codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+            start = 0
+            for end in _sentence_ends(codepoints).tolist():
+                yield text[start:end]
+                start = end
+            return
 
-        return segmented
+        sentences = _SENTENCE_SPLIT_RE.split(text)
+        for i in range(0, len(sentences), 2):
+            if i + 1 < len(sentences):
+                yield sentences[i] + sentences[i + 1]
+            else:
+                yield sentences[i]
 
     def _split_long_segment(self, segment: DialogueSegment) -> List[DialogueSegment]:
         """Split a long segment while preserving context"""
-        text = segment.text
         segments = []
 
         # Split at sentence boundaries when possible
-        sentences = re.split(r'([。！？.!?])', text)
-        current_text = ""
+        buf: List[str] = []
+        buf_len = 0
 
-        for i in range(0, len(sentences), 2):
-            if i + 1 < len(sentences):
-                sentence = sentences[i] + sentences[i + 1]
-            else:
-                sentence = sentences[i]
-
-            if len(current_text + sentence) > self.max_chars and current_text:
-                segments.append(DialogueSegment(
-                    text=current_text,
-                    character=segment.character,
-                    emotion=segment.emotion,
-                    alpha=segment.alpha,
-                    is_dialogue=segment.is_dialogue,
-                    position=segment.position
-                ))
+        for sentence in self._iter_sentences(segment.text):
+            if buf_len + len(sentence) > self.max_chars and buf:
+                chunk = ''.join(buf)
+                segments.append(replace(segment, text=chunk))
                 # Add overlap for smooth transition
-                if self.overlap_chars > 0:
-                    overlap_start = max(0, len(current_text) - self.overlap_chars)
-                    current_text = current_text[overlap_start:]
-                else:
-                    current_text = ""
+                buf = [chunk[-self.overlap_chars:]] if self.overlap_chars > 0 else []
+                buf_len = len(buf[0]) if buf else 0
 
-            current_text += sentence
+            buf.append(sentence)
+            buf_len += len(sentence)
 
-        if current_text:
-            segments.append(DialogueSegment(
-                text=current_text,
-                character=segment.character,
-                emotion=segment.emotion,
-                alpha=segment.alpha,
-                is_dialogue=segment.is_dialogue,
-                position=segment.position
-            ))
+        if buf_len:
+            segments.append(replace(segment, text=''.join(buf)))
 
         return segments
 
 
+def _prefetch(items: Iterable, depth: int = 2) -> Iterator:
+    """
+    Run an iterable on a background thread and yield its items, keeping up to `depth`
+    items queued so the producer (GPU inference) overlaps with the consumer's work.
+    Exceptions raised by the producer are re-raised in the consumer.
+    """
+    done = object()
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+        except BaseException as e:
+            put((done, e))
+            return
+        put((done, None))
+
+    producer = threading.Thread(target=produce, name="segment-producer", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        # Unblock the producer if the consumer stops early
+        stop.set()
+        producer.join()
+
+
+def resolve_precision(name: str = "auto") -> "torch.dtype":
+    """
+    Model weight type for a precision name: "bf16", "fp16", "fp32" or "auto".
+    "auto" picks bfloat16 on GPUs with native support (compute capability 8.0+), float16 otherwise.
+    """
+    if name == "auto":
+        if torch.cuda.is_available() and torch.cuda.get_device_capability() >= (8, 0):
+            return torch.bfloat16
+        return torch.float16
+    return {"bf16": torch.bfloat16, "fp16": torch.float16, "fp32": torch.float32}[name]
+
+
 class MultiCharacterEmotionGenerator:
     """Generate long-form audio with multiple characters and emotions"""
 
-    def __init__(self, config_path: str, model_dir: str = "./checkpoints",
-                 config_file: str = "./checkpoints/config.yaml", cuda_kernel: bool = False):
-        self.dialogue_parser = CharacterDialogueParser(config_path)
+    # Only lines up to this length are cached; repeats are short (names, replies, refrains)
+    _AUDIO_CACHE_MAX_CHARS = 50
+    # Batches of look-ahead in which segments with the same conditioning are grouped
+    _REORDER_WINDOW_BATCHES = 4
+
+    def __init__(self, config_path: Optional[str] = None, model_dir: str = "./checkpoints",
+                 config_file: str = "./checkpoints/config.yaml", cuda_kernel: bool = False,
+                 batch_size: int = 4, fp16: bool = True, audio_cache_size: int = 256,
+                 config_dict: Optional[Dict] = None, precision: Optional["torch.dtype"] = None):
+        self.dialogue_parser = CharacterDialogueParser(config_path, config_dict=config_dict)
         self.segmenter = TextSegmenter()
         self.model_dir = model_dir
         self.config_file = config_file
         self.cuda_kernel = cuda_kernel
+        # Half precision weights by default (fp16=False loads FP32 weights). An explicit weight
+        # type (see resolve_precision) overrides fp16, float32 disables half precision
+        if precision is not None:
+            fp16 = precision != torch.float32
+        self.fp16 = fp16
+        self.precision = precision if fp16 else None
+        self.batch_size = batch_size  # Max segments per batched inference call, 1 disables batching
         self.tts_model = None  # Single TTS model for all characters
-
-        # Initialize TTS models
+        # char_id -> ((abs voice path, mtime_ns), encoded speaker prompt on the model device)
+        self._spk_cache: Dict[str, Tuple[Tuple[str, int], Dict]] = {}
+        # Characters whose voice file has been stat'ed during the current run
+        self._spk_checked: set = set()
+        self._resamplers: Dict[Tuple[int, int], torchaudio.transforms.Resample] = {}
+        # LRU of generated audio for repeated short lines, keyed by _audio_cache_key(); 0 disables
+        self.audio_cache_size = audio_cache_size
+        self._audio_cache: "OrderedDict[Tuple, Tuple[torch.Tensor, int]]" = OrderedDict()
+
+        # Initialize TTS models; voice prompts are encoded per script, for the characters it uses
         self._initialize_tts_models()
 
     def _initialize_tts_models(self):
@@ -441,13 +630,67 @@ class MultiCharacterEmotionGenerator:
             self.tts_model = IndexTTS2(
                 model_dir=self.model_dir,
                 cfg_path=self.config_file,
-                use_cuda_kernel=self.cuda_kernel
+                use_fp16=self.fp16,
+                use_cuda_kernel=self.cuda_kernel,
+                half_dtype=self.precision
             )
             print("Successfully loaded TTS model")
         except Exception as e:
             print(f"Warning: Failed to load TTS model: {e}")
             self.tts_model = None
 
+    def update_characters(self, config_dict: Dict):
+        """
+        Swap in a new character configuration without reloading the TTS model.
+        Voice prompts are re-encoded on next use, only for characters whose voice file changed.
+        """
+        self.dialogue_parser = CharacterDialogueParser(config_dict=config_dict)
+        # Generated audio may belong to a character whose voice or settings changed
+        self._audio_cache.clear()
+        self._spk_checked.clear()
+        for char_id in list(self._spk_cache):
+            if char_id not in self.dialogue_parser.characters:
+                del self._spk_cache[char_id]
+
+    def _encode_character_voices(self, char_ids: Iterable[str]):
+        """Encode the given characters' voice prompts up front, so segments reuse the embeddings"""
+        if self.tts_model is None:
+            return
+        for char_id in char_ids:
+            if char_id in self.dialogue_parser.characters:
+                self._get_spk_cond(char_id)
+
+    def _get_spk_cond(self, char_id: str) -> Optional[Dict]:
+        """
+        Cached speaker conditioning for a character, re-encoded if the voice file changed.
+        Returns None if the voice file can't be encoded (callers fall back to the path).
+        The voice file is stat'ed once per run, not once per segment.
+        """
+        cached = self._spk_cache.get(char_id)
+        if char_id in self._spk_checked:
+            return cached[1] if cached is not None else None
+        self._spk_checked.add(char_id)
+
+        voice_file = os.path.abspath(self.dialogue_parser.characters[char_id].voice_file)
+        try:
+            key = (voice_file, os.stat(voice_file).st_mtime_ns)
+        except OSError as e:
+            print(f"Warning: Voice file for {char_id} not accessible: {e}")
+            self._spk_cache.pop(char_id, None)
+            return None
+
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        try:
+            spk_cond = self.tts_model.encode_speaker_prompt(voice_file)
+        except Exception as e:
+            print(f"Warning: Failed to encode voice for {char_id}: {e}")
+            self._spk_cache.pop(char_id, None)
+            return None
+        self._spk_cache[char_id] = (key, spk_cond)
+        return spk_cond
+
     def generate_audio(self, input_text: str, output_file: str,
                       segment_chars: int = 200, fp16: bool = True,
                       cuda_kernel: bool = False, deepspeed: bool = False,
@@ -459,6 +702,9 @@ class MultiCharacterEmotionGenerator:
 
         # Parse dialogue segments
         dialogue_segments = self.dialogue_parser.parse_text_with_characters(input_text)
+        # Pick up voice files edited since the last run, then encode each voice the script uses once
+        self._spk_checked.clear()
+        self._encode_character_voices(dict.fromkeys(segment.character for segment in dialogue_segments))
 
         if verbose:
             print(f"Found {len(dialogue_segments)} dialogue segments")
@@ -478,79 +724,249 @@ class MultiCharacterEmotionGenerator:
         if verbose:
             print(f"Segmented into {len(segmented_dialogue)} audio segments")
 
-        # Generate audio segments
-        audio_segments = []
-        temp_dir = tempfile.mkdtemp()
+        # Generate audio segments on a background thread, post-processing each one
+        # while the next is being generated
+        audio_segments = _prefetch(self._generate_segments(segmented_dialogue, fp16, cuda_kernel, verbose))
 
-        try:
-            for i, segment in enumerate(segmented_dialogue):
-                if verbose:
-                    print(f"Generating segment {i+1}/{len(segmented_dialogue)}...")
+        # Concatenate all segments
+        if self._concatenate_audio_segments(audio_segments, output_file, verbose):
+            print(f"Successfully generated audio: {output_file}")
+        else:
+            print("Warning: No audio segments were generated")
+
+    def _generate_segments(self, segments: List[DialogueSegment], fp16: bool, cuda_kernel: bool,
+                           verbose: bool = False) -> Iterator[Tuple[torch.Tensor, int]]:
+        """Generate (wav, sampling_rate) tuples for all segments, lazily and in segment order"""
+        if self.batch_size > 1:
+            yield from self._generate_batched_audio(segments, verbose)
+            return
+
+        for i, segment in enumerate(segments):
+            if verbose:
+                print(f"Generating segment {i+1}/{len(segments)}...")
+
+            audio_segment = self._generate_segment_audio(segment, i, fp16, cuda_kernel)
+            if audio_segment is not None:
+                yield audio_segment
+
+    def _segment_conditioning(self, segment: DialogueSegment) -> Tuple[float, int]:
+        """Emotion alpha and speech speed used to synthesize a segment"""
+        character = self.dialogue_parser.characters[segment.character]
+
+        # Adjust emotion alpha based on dialogue vs narration
+        adjusted_alpha = float(_adjust_alpha(segment.alpha, segment.is_dialogue))
+        return adjusted_alpha, self._speech_speed(character)
+
+    @staticmethod
+    def _speech_speed(character: CharacterConfig) -> int:
+        """Determine speech speed: 0 = normal, 1 = fast"""
+        # More granular speech speed mapping
+        if character.speech_rate >= 1.3:
+            return 1  # Fast speech for excited/angry emotions
+        elif character.speech_rate <= 0.8:
+            return 0  # Normal speed for sad/calm emotions
+        else:
+            # For medium speeds (0.8-1.3), use normal speed but adjust via emotion
+            return 0
+
+    def _generate_batched_audio(self, segments: List[DialogueSegment],
+                                verbose: bool = False) -> Iterator[Tuple[torch.Tensor, int]]:
+        """
+        Generate audio for all segments, batching segments that share the same character
+        and conditioning into a single inference call. Within a window of a few batches,
+        matching segments are batched together even when other characters' lines sit between
+        them (e.g. alternating dialogue), and the audio is re-ordered before it is yielded.
+        Yields the generated (wav, sampling_rate) tuples, in segment order.
+        """
+        if self.tts_model is None:
+            print(f"Warning: TTS model not available")
+            return
 
-                audio_segment = self._generate_segment_audio(segment, temp_dir, i, fp16, cuda_kernel)
-                if audio_segment is not None:
-                    audio_segments.append(audio_segment)
+        # Conditioning columns: segments batch together while all of them stay equal
+        script = ParsedScript.from_segments(segments)
+        characters = self.dialogue_parser.characters
+        names, inverse = np.unique(script.characters, return_inverse=True)
+        speeds = np.array([self._speech_speed(characters[name]) for name in names], dtype=np.int64)[inverse]
+        alphas = np.round(_adjust_alpha(script.alphas, script.is_dialogue), 3)
+        # Emotion text and emotion only matter when emotion processing is enabled
+        emotional = alphas > 0.0
+        emo_texts = np.where(emotional, script.emo_texts, None)
+        emotions = np.where(emotional & ~emo_texts.astype(bool), script.emotions, None)
+
+        columns = (script.characters, emotions, alphas, speeds, emo_texts)
+        bounds = np.append(ParsedScript.run_starts(*columns), len(script)).tolist()
+        window = self.batch_size * self._REORDER_WINDOW_BATCHES
+
+        # Runs of equal conditioning are collected into windows; inside a window the runs
+        # sharing a key are generated together
+        window_runs: Dict[Tuple, List[int]] = {}
+        window_size = 0
+        for run_start, run_end in zip(bounds, bounds[1:]):
+            key = tuple(col[run_start] for col in columns)
+            window_runs.setdefault(key, []).extend(range(run_start, run_end))
+            window_size += run_end - run_start
+            if window_size >= window or run_end == len(segments):
+                yield from self._generate_window(segments, window_runs.values(), verbose)
+                window_runs = {}
+                window_size = 0
+
+    def _generate_window(self, segments: List[DialogueSegment], groups: Iterable[List[int]],
+                         verbose: bool = False) -> Iterator[Tuple[torch.Tensor, int]]:
+        """
+        Generate a window of segments given as groups of indices with shared conditioning,
+        yielding the audio in segment order as soon as it is contiguous.
+        """
+        groups = list(groups)
+        ready: Dict[int, Optional[Tuple[torch.Tensor, int]]] = {}
+        next_out = min(indices[0] for indices in groups)
+        for indices in groups:
+            for start in range(0, len(indices), self.batch_size):
+                batch = indices[start:start + self.batch_size]
+                if verbose:
+                    labels = ", ".join(str(i + 1) for i in batch)
+                    print(f"Generating segments {labels}/{len(segments)}...")
+
+                ready.update(zip(batch, self._batch_infer([segments[i] for i in batch], batch)))
+                while next_out in ready:
+                    audio = ready.pop(next_out)
+                    if audio is not None:
+                        yield audio
+                    next_out += 1
+
+    def _audio_cache_key(self, segment: DialogueSegment) -> Optional[Tuple]:
+        """Key identifying a segment's generated audio, or None if it isn't worth caching"""
+        text = segment.text.strip()
+        if not self.audio_cache_size or len(text) > self._AUDIO_CACHE_MAX_CHARS:
+            return None
+        # The voice version (path, mtime_ns) of the speaker cache, so audio generated with
+        # a voice file that has since changed is not reused (generate_audio refreshes it before
+        # generating); no voice prompt, no caching
+        spk = self._spk_cache.get(segment.character)
+        if spk is None:
+            return None
+        adjusted_alpha, use_speed = self._segment_conditioning(segment)
+        emotion = (segment.emo_text or segment.emotion) if adjusted_alpha > 0.0 else None
+        return segment.character, spk[0], text, emotion, round(adjusted_alpha, 2), use_speed
 
-            # Concatenate all segments
-            if audio_segments:
-                self._concatenate_audio_segments(audio_segments, output_file, verbose)
-                print(f"Successfully generated audio: {output_file}")
+    def _get_cached_audio(self, key: Optional[Tuple]) -> Optional[Tuple[torch.Tensor, int]]:
+        """Look up generated audio, marking it as recently used"""
+        if key is None:
+            return None
+        audio = self._audio_cache.get(key)
+        if audio is not None:
+            self._audio_cache.move_to_end(key)
+        return audio
+
+    def _cache_audio(self, key: Optional[Tuple], audio: Optional[Tuple[torch.Tensor, int]]):
+        """Store generated audio, evicting the least recently used entry when full"""
+        if key is None or audio is None:
+            return
+        self._audio_cache[key] = audio
+        self._audio_cache.move_to_end(key)
+        if len(self._audio_cache) > self.audio_cache_size:
+            self._audio_cache.popitem(last=False)
+
+    @torch.inference_mode()
+    def _batch_infer(self, segments: List[DialogueSegment],
+                     segment_indices: List[int]) -> List[Optional[Tuple[torch.Tensor, int]]]:
+        """
+        Generate audio for segments that share character and conditioning in one batched call.
+        Returns one (wav, sampling_rate) tuple per segment, None for segments that failed.
+        """
+        # Reuse audio for repeated lines, only the rest goes to the model (repeats within
+        # the batch are generated once)
+        cache_keys = [self._audio_cache_key(segment) for segment in segments]
+        results = [self._get_cached_audio(key) for key in cache_keys]
+        pending, repeats, seen = [], [], {}
+        for i, audio in enumerate(results):
+            if audio is not None:
+                continue
+            if cache_keys[i] is not None and cache_keys[i] in seen:
+                repeats.append((i, seen[cache_keys[i]]))
+            else:
+                seen.setdefault(cache_keys[i], i)
+                pending.append(i)
+        if not pending:
+            return results
+
+        first = segments[0]
+        character = self.dialogue_parser.characters[first.character]
+        adjusted_alpha, use_speed = self._segment_conditioning(first)
+
+        infer_kwargs = {}
+        if adjusted_alpha > 0.0:
+            if first.emo_text:
+                # Use descriptive emotion text with Qwen emotion model
+                infer_kwargs.update(use_emo_text=True, emo_text=first.emo_text, emo_alpha=adjusted_alpha)
             else:
-                print("Warning: No audio segments were generated")
+                # Use traditional emotion vector approach
+                emotion_vector = self._create_emotion_vector(first.emotion, adjusted_alpha)
+                infer_kwargs.update(emo_vector=emotion_vector, emo_alpha=adjusted_alpha)
+        # else: no emotion processing - use pure voice cloning for original sample sound
 
-        finally:
-            # Clean up temporary files
-            shutil.rmtree(temp_dir, ignore_errors=True)
+        # Use the cached speaker embedding, or fall back to the voice file path
+        spk_cond = self._get_spk_cond(first.character)
 
-    def _generate_segment_audio(self, segment: DialogueSegment, temp_dir: str,
-                               segment_index: int, fp16: bool, cuda_kernel: bool) -> Optional[str]:
+        try:
+            generated = self.tts_model.infer_batch(
+                spk_audio_prompt=None if spk_cond is not None else character.voice_file,
+                spk_cond=spk_cond,
+                texts=[segments[i].text for i in pending],
+                return_tensor=True,
+                use_random=False,
+                verbose=False,
+                max_batch_size=self.batch_size,
+                use_speed=use_speed,
+                **infer_kwargs
+            )
+        except Exception as e:
+            print(f"Error generating segments {', '.join(str(i) for i in segment_indices)}: {e}")
+            return results
+
+        for i, audio in zip(pending, generated):
+            self._cache_audio(cache_keys[i], audio)
+            results[i] = audio
+        for i, source in repeats:
+            results[i] = results[source]
+        return results
+
+    @torch.inference_mode()
+    def _generate_segment_audio(self, segment: DialogueSegment, segment_index: int,
+                               fp16: bool, cuda_kernel: bool) -> Optional[Tuple[torch.Tensor, int]]:
         """Generate audio for a single segment"""
 
         if self.tts_model is None:
             print(f"Warning: TTS model not available")
             return None
 
+        # Reuse audio for repeated lines
+        cache_key = self._audio_cache_key(segment)
+        audio = self._get_cached_audio(cache_key)
+        if audio is not None:
+            return audio
+
         tts = self.tts_model
         character = self.dialogue_parser.characters[segment.character]
-
-        # Adjust emotion alpha based on dialogue vs narration
-        # For very low alpha values (<= 0.1), use no emotion to avoid affecting speech rate
-        if segment.alpha <= 0.1:
-            # Use no emotion processing for normal speech rate
-            adjusted_alpha = 0.0
-        elif segment.is_dialogue:
-            # Dialogue has stronger emotion expression
-            adjusted_alpha = min(1.0, segment.alpha * 1.2)
-        else:
-            # Narration has more subtle emotion
-            adjusted_alpha = segment.alpha * 0.8
+        adjusted_alpha, use_speed = self._segment_conditioning(segment)
 
         # Generate audio
         try:
-            output_path = os.path.join(temp_dir, f"segment_{segment_index:04d}.wav")
-
-            # Use original audio file (IndexTTS2 will handle stereo/mono conversion)
-            voice_file = character.voice_file
-
-            # Determine speech speed: 0 = normal, 1 = fast
-            # More granular speech speed mapping
-            if character.speech_rate >= 1.3:
-                use_speed = 1  # Fast speech for excited/angry emotions
-            elif character.speech_rate <= 0.8:
-                use_speed = 0  # Normal speed for sad/calm emotions
-            else:
-                # For medium speeds (0.8-1.3), use normal speed but adjust via emotion
-                use_speed = 0
+            # Use the cached speaker embedding, or the original audio file if it isn't
+            # available (IndexTTS2 will handle stereo/mono conversion)
+            spk_cond = self._get_spk_cond(segment.character)
+            voice_file = None if spk_cond is not None else character.voice_file
 
             # Check if we should use emotion processing (alpha > 0)
             if adjusted_alpha > 0.0:
                 # Check if we have descriptive emotion text
                 if segment.emo_text:
                     # Use descriptive emotion text with Qwen emotion model
-                    tts.infer(
+                    audio = tts.infer(
                         spk_audio_prompt=voice_file,
+                        spk_cond=spk_cond,
                         text=segment.text,
-                        output_path=output_path,
+                        output_path=None,
+                        return_tensor=True,
                         use_emo_text=True,
                         emo_text=segment.emo_text,
                         emo_alpha=adjusted_alpha,
@@ -561,10 +977,12 @@ class MultiCharacterEmotionGenerator:
                 else:
                     # Use traditional emotion vector approach
                     emotion_vector = self._create_emotion_vector(segment.emotion, adjusted_alpha)
-                    tts.infer(
+                    audio = tts.infer(
                         spk_audio_prompt=voice_file,
+                        spk_cond=spk_cond,
                         text=segment.text,
-                        output_path=output_path,
+                        output_path=None,
+                        return_tensor=True,
                         emo_vector=emotion_vector,
                         emo_alpha=adjusted_alpha,
                         use_random=False,
@@ -573,20 +991,24 @@ class MultiCharacterEmotionGenerator:
                     )
             else:
                 # No emotion processing - use pure voice cloning for original sample sound
-                tts.infer(
+                audio = tts.infer(
                     spk_audio_prompt=voice_file,
+                    spk_cond=spk_cond,
                     text=segment.text,
-                    output_path=output_path,
+                    output_path=None,
+                    return_tensor=True,
                     use_random=False,
                     verbose=False,
                     use_speed=use_speed
                 )
-            return output_path
 
         except Exception as e:
             print(f"Error generating segment {segment_index}: {e}")
             return None
 
+        self._cache_audio(cache_key, audio)
+        return audio
+
     def _create_emotion_vector(self, emotion: str, alpha: float) -> torch.Tensor:
         """Create 8-dimensional emotion vector in IndexTTS2 format: [happy, angry, sad, afraid, disgusted, melancholic, surprised, calm]"""
         emotions = ['happy', 'angry', 'sad', 'afraid', 'disgusted', 'melancholic', 'surprised', 'calm']
@@ -599,51 +1021,60 @@ class MultiCharacterEmotionGenerator:
 
         return emotion_vector
 
-    def _concatenate_audio_segments(self, audio_segments: List[str], output_file: str, verbose: bool = False):
-        """Concatenate multiple audio segments into final output"""
-
-        if not audio_segments:
-            return
-
-        # Load all audio segments
-        audio_data = []
+    def _resample(self, audio: torch.Tensor, source_sr: int, target_sr: int) -> torch.Tensor:
+        """Resample audio with a Resample module cached per rate pair, keeping its dtype"""
+        key = (source_sr, target_sr)
+        resampler = self._resamplers.get(key)
+        if resampler is None:
+            resampler = self._resamplers[key] = torchaudio.transforms.Resample(source_sr, target_sr)
+        resampled = resampler(audio.float())
+        if audio.dtype.is_floating_point:
+            return resampled.to(audio.dtype)
+        # Sinc overshoot on near full scale audio would wrap around in the integer cast
+        limits = torch.iinfo(audio.dtype)
+        return resampled.round_().clamp_(limits.min, limits.max).to(audio.dtype)
+
+    def _concatenate_audio_segments(self, audio_segments: Iterable[Tuple[torch.Tensor, int]], output_file: str,
+                                    verbose: bool = False) -> bool:
+        """
+        Write audio segments to the output file as they arrive, with small pauses between
+        segments for natural flow, so only one segment is held in memory at a time.
+        Returns False if there were no segments to write.
+        """
         sample_rate = 24000
+        pause = None
+        writer = None
+        total_samples = 0
 
-        for segment_file in audio_segments:
-            try:
-                audio, sr = torchaudio.load(segment_file)
+        try:
+            for audio, sr in audio_segments:
+                # Bring the segment to the output sample rate
                 if sr != sample_rate:
-                    audio = torchaudio.functional.resample(audio, sr, sample_rate)
-                audio_data.append(audio)
-            except Exception as e:
-                print(f"Warning: Failed to load audio segment {segment_file}: {e}")
-
-        if not audio_data:
-            print("Error: No valid audio segments to concatenate")
-            return
-
-        # Concatenate all segments
-        final_audio = torch.cat(audio_data, dim=1)
-
-        # Add small pauses between segments for natural flow
-        pause_samples = int(0.1 * sample_rate)  # 0.1 second pause
-        pause = torch.zeros(1, pause_samples)
+                    audio = self._resample(audio, sr, sample_rate)
 
-        final_with_pauses = []
-        for i, audio in enumerate(audio_data):
-            final_with_pauses.append(audio)
-            if i < len(audio_data) - 1:
-                final_with_pauses.append(pause)
+                if writer is None:
+                    writer = sf.SoundFile(output_file, mode='w', samplerate=sample_rate,
+                                          channels=audio.size(0), subtype='PCM_16')
+                    pause = np.zeros((int(0.1 * sample_rate), audio.size(0)), dtype=np.int16)  # 0.1 second pause
+                else:
+                    writer.write(pause)
+                    total_samples += pause.shape[0]
 
-        final_audio = torch.cat(final_with_pauses, dim=1)
+                writer.write(audio.t().numpy())
+                total_samples += audio.size(1)
+        finally:
+            if writer is not None:
+                writer.close()
 
-        # Save final audio
-        torchaudio.save(output_file, final_audio, sample_rate)
+        if writer is None:
+            return False
 
         if verbose:
-            duration = final_audio.shape[1] / sample_rate
+            duration = total_samples / sample_rate
             print(f"Final audio duration: {duration:.2f} seconds")
 
+        return True
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -671,8 +1102,10 @@ def main():
                        help="Model config file")
     parser.add_argument("--segment-chars", type=int, default=200,
                        help="Maximum characters per segment")
-    parser.add_argument("--fp16", action="store_true", default=True,
-                       help="Use FP16 inference")
+    parser.add_argument("--batch-size", type=int, default=4,
+                       help="Max segments per batched inference call (1 disables batching)")
+    parser.add_argument("--fp16", action=argparse.BooleanOptionalAction, default=True,
+                       help="Load the model in FP16 (--no-fp16 for FP32 weights)")
     parser.add_argument("--cuda-kernel", action="store_true",
                        help="Use CUDA kernel optimization")
     parser.add_argument("--deepspeed", action="store_true",
@@ -688,14 +1121,10 @@ def main():
         if not os.path.exists(args.input):
             print(f"Error: Input file {args.input} not found")
             sys.exit(1)
-        with open(args.input, 'r', encoding='utf-8') as f:
-            file_content = f.read()
-
         # Check if file is JSON and extract both script_content and character_config
         if args.input.endswith('.json'):
             try:
-                import json
-                data = json.loads(file_content)
+                data = _json_loads(Path(args.input).read_bytes())
                 if 'output' in data:
                     if 'script_content' not in data['output']:
                         print("Error: JSON file must contain 'output.script_content' field")
@@ -711,41 +1140,26 @@ def main():
                 print(f"Error: Invalid JSON file - {e}")
                 sys.exit(1)
         else:
-            input_text = file_content
+            with open(args.input, 'r', encoding='utf-8') as f:
+                input_text = f.read()
     else:
         input_text = args.text
 
-    # Determine configuration source
-    config_to_use = args.config
-    if embedded_config:
-        # Use embedded config from JSON
-        if args.config:
-            print("Warning: Both --config and embedded character_config provided. Using embedded config.")
-        # Create temporary config file with embedded config
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as temp_file:
-            json.dump(embedded_config, temp_file, ensure_ascii=False, indent=2)
-            config_to_use = temp_file.name
-        print(f"Using embedded character configuration from JSON input")
-    elif not args.config:
-        # No config provided, use default
-        default_config = os.path.join(os.path.dirname(__file__), '../config/character_config.json')
-        if os.path.exists(default_config):
-            config_to_use = default_config
-            print(f"Using default character configuration: {default_config}")
-        else:
-            print("Error: No character configuration provided and default config not found")
-            print("Please either:")
-            print("  1. Include character_config in your JSON input")
-            print("  2. Use --config parameter")
-            print("  3. Create default config at multi_person_support/config/character_config.json")
-            sys.exit(1)
-
-    # Check if required files exist
-    if not os.path.exists(config_to_use):
-        print(f"Error: Configuration file {config_to_use} not found")
+    # Determine configuration source, the embedded config is passed to the generator as is
+    try:
+        config_to_use, embedded_config = resolve_config_source(args.config, embedded_config)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if config_to_use is None and embedded_config is None:
+        print("Error: No character configuration provided and default config not found")
+        print("Please either:")
+        print("  1. Include character_config in your JSON input")
+        print("  2. Use --config parameter")
+        print("  3. Create default config at multi_person_support/config/character_config.json")
         sys.exit(1)
 
+    # Check if required files exist
     if not os.path.exists(args.model_dir):
         print(f"Error: Model directory {args.model_dir} not found")
         sys.exit(1)
@@ -755,16 +1169,12 @@ def main():
         config_path=config_to_use,
         model_dir=args.model_dir,
         config_file=args.config_file,
-        cuda_kernel=args.cuda_kernel
+        cuda_kernel=args.cuda_kernel,
+        batch_size=args.batch_size,
+        fp16=args.fp16,
+        config_dict=embedded_config
     )
 
-    # Clean up temporary config file if created
-    if embedded_config and config_to_use != args.config:
-        try:
-            os.unlink(config_to_use)
-        except:
-            pass
-
     # Generate audio
     generator.generate_audio(
         input_text=input_text,
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Client for the persistent SSH/N8N TTS Processor
+
+Sends one request to `ssh_n8n_processor.py --serve` over its Unix socket, so each
+n8n call skips Python/torch startup and the model load. Only the standard library
+is imported to keep startup fast.
+
+Usage:
+    python ssh_n8n_client.py --input-json "n8n_data.json" --output "output.wav"
+    python ssh_n8n_client.py --script "{[narrator]:[calm:0.3]}Hello world" --output "output.wav"
+"""
+
+import os
+import sys
+import json
+import socket
+import argparse
+
+# Default Unix socket of ssh_n8n_processor.py --serve
+DEFAULT_SOCKET = "/tmp/indextts2_n8n.sock"
+
+
+def send_request(socket_path: str, request: dict) -> dict:
+    """
+    Send a request to the processor and wait for its reply
+
+    Args:
+        socket_path: Unix socket the processor is serving on
+        request: Request dictionary, see ssh_n8n_processor._handle_request
+
+    Returns:
+        Reply dictionary from the processor
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8') + b"\n")
+        with sock.makefile('rb') as reply:
+            line = reply.readline()
+    if not line:
+        raise ConnectionError("Processor closed the connection without replying")
+    return json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Client for ssh_n8n_processor.py --serve",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--output", "-o", required=True,
+                       help="Output audio file path")
+
+    # Input source (mutually exclusive)
+    input_group = parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument("--input-json", "-j",
+                            help="Input JSON file with n8n output data")
+    input_group.add_argument("--script", "-s",
+                            help="Direct script input with character dialogue and emotion tags")
+
+    parser.add_argument("--socket", default=DEFAULT_SOCKET,
+                       help="Unix socket the processor is serving on")
+    parser.add_argument("--verbose", action="store_true",
+                       help="Enable verbose output in the processor log")
+
+    args = parser.parse_args()
+
+    # The processor runs in its own working directory, so send absolute paths
+    request = {"output": os.path.abspath(args.output), "verbose": args.verbose}
+    if args.input_json:
+        request["input_json"] = os.path.abspath(args.input_json)
+    else:
+        request["script"] = args.script
+
+    try:
+        reply = send_request(args.socket, request)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not reach TTS processor on {args.socket}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if reply.get("success"):
+        print(reply["output"])
+        sys.exit(0)
+    print(f"Error: {reply.get('error', 'TTS processing failed')}", file=sys.stderr)
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
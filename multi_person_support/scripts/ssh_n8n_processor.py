@@ -8,14 +8,14 @@ It handles multi-character scripts with emotion tags and generates audio files.
 Usage:
     python ssh_n8n_processor.py --config character_config.json --input-json "n8n_data.json" --output "output.wav"
     python ssh_n8n_processor.py --config character_config.json --script "{[narrator]:[calm:0.3]}Hello world" --output "output.wav"
+    python ssh_n8n_processor.py --config character_config.json --serve --socket /tmp/indextts2_n8n.sock
 """
 
 import os
 import sys
 import json
 import argparse
-import tempfile
-import traceback
+import socketserver
 from pathlib import Path
 from typing import Dict, Any, Optional
 import logging
@@ -29,18 +29,45 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 sys.path.append(os.path.join(current_dir, "indextts"))
 
+from _config_utils import default_config_path, resolve_config_source
+
+# Default Unix socket for --serve, matches ssh_n8n_client.py
+DEFAULT_SOCKET = "/tmp/indextts2_n8n.sock"
+
+# orjson reads and writes JSON several times faster; stdlib json is the fallback
 try:
-    from multi_character_emotion_generator import MultiCharacterEmotionGenerator
-except ImportError as e:
-    logger.error(f"Error importing multi_character_emotion_generator: {e}")
-    sys.exit(1)
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+
+    def _read_json(path: str) -> Any:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    def _write_json(obj: Any, path: str):
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    def _read_json(path: str) -> Any:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_json(obj: Any, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
 
 
 class SSHN8NProcessor:
     """Process TTS commands from SSH/n8n inputs"""
 
     def __init__(self, config_path: Optional[str] = None, model_dir: str = "./checkpoints",
-                 config_file: str = "./checkpoints/config.yaml"):
+                 config_file: str = "./checkpoints/config.yaml", precision: str = "auto"):
         """
         Initialize the IndexTTS2 processor
 
@@ -48,11 +75,16 @@ class SSHN8NProcessor:
             config_path: Path to character configuration JSON file (optional)
             model_dir: Directory containing model files
             config_file: Model configuration file
+            precision: Model weight precision: "auto" (bf16 on Ampere and newer GPUs, fp16 otherwise),
+                "bf16", "fp16" or "fp32"
         """
         self.config_path = config_path
         self.model_dir = model_dir
         self.config_file = config_file
+        self.precision = precision
         self.generator = None
+        # Set once a request's character_config replaced the base characters
+        self._characters_overridden = False
 
         # Initialize the generator if config is provided, otherwise defer initialization
         if config_path:
@@ -60,18 +92,24 @@ class SSHN8NProcessor:
         else:
             logger.info("No initial config provided - will initialize when embedded config is available")
 
-    def _initialize_generator(self, config_path: Optional[str] = None):
-        """Initialize the multi-character emotion generator"""
+    def _initialize_generator(self, config_path: Optional[str] = None,
+                              config_dict: Optional[Dict[str, Any]] = None):
+        """Initialize the multi-character emotion generator from a config file or dictionary"""
         try:
             use_config_path = config_path or self.config_path
-            if not use_config_path:
-                raise ValueError("No configuration path provided for generator initialization")
+            if config_dict is None and not use_config_path:
+                raise ValueError("No configuration provided for generator initialization")
+
+            # Imported here so torch and the model code only load when a generator is needed
+            from multi_character_emotion_generator import MultiCharacterEmotionGenerator, resolve_precision
 
             self.generator = MultiCharacterEmotionGenerator(
                 config_path=use_config_path,
                 model_dir=self.model_dir,
                 config_file=self.config_file,
-                cuda_kernel=False  # Default to False for SSH safety
+                cuda_kernel=False,  # Default to False for SSH safety
+                config_dict=config_dict,
+                precision=resolve_precision(self.precision)
             )
             logger.info("Successfully initialized IndexTTS2 generator")
         except Exception as e:
@@ -102,6 +140,8 @@ class SSHN8NProcessor:
             char_config = n8n_data.get('output', {}).get('character_config')
             if char_config:
                 self._update_character_config(char_config)
+            else:
+                self._restore_base_config()
 
             # Generate audio
             self.generator.generate_audio(
@@ -118,8 +158,7 @@ class SSHN8NProcessor:
             return True
 
         except Exception as e:
-            logger.error(f"Error processing n8n output: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error processing n8n output: {e}")
             return False
 
     def process_direct_script(self, script_text: str, output_file: str,
@@ -136,6 +175,8 @@ class SSHN8NProcessor:
             True if successful, False otherwise
         """
         try:
+            self._restore_base_config()
+
             # Generate audio directly from script
             self.generator.generate_audio(
                 input_text=script_text,
@@ -151,8 +192,7 @@ class SSHN8NProcessor:
             return True
 
         except Exception as e:
-            logger.error(f"Error processing direct script: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error processing direct script: {e}")
             return False
 
     def _update_character_config(self, char_config: Dict[str, Any]):
@@ -163,34 +203,43 @@ class SSHN8NProcessor:
             char_config: Character configuration dictionary
         """
         try:
-            # Create a temporary config file with the new configuration
-            temp_config = self._create_temp_config(char_config)
-
-            # Reinitialize generator with new config
-            self._initialize_generator(temp_config)
-
-            # Clean up temp file
-            os.remove(temp_config)
+            # Merge the new characters into the base configuration
+            config = self._build_config(char_config)
+
+            # Swap the characters into the loaded generator, the model itself is unchanged
+            if self.generator is None:
+                self._initialize_generator(config_dict=config)
+            else:
+                self.generator.update_characters(config)
+            self._characters_overridden = True
             logger.info("Successfully updated character configuration")
 
         except Exception as e:
             logger.error(f"Error updating character configuration: {e}")
             # Continue with existing configuration
 
-    def _create_temp_config(self, char_config: Dict[str, Any]) -> str:
+    def _restore_base_config(self):
+        """
+        Drop characters a previous request swapped in, so a long-running processor
+        handles each request as a fresh invocation would
+        """
+        if self._characters_overridden and self.generator is not None:
+            self.generator.update_characters(self._build_config({}))
+            self._characters_overridden = False
+
+    def _build_config(self, char_config: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Create a temporary configuration file with updated character data
+        Build a configuration with updated character data
 
         Args:
             char_config: Character configuration dictionary
 
         Returns:
-            Path to temporary configuration file
+            Configuration dictionary with the converted characters merged in
         """
         # Load existing config as base
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                base_config = json.load(f)
+            base_config = _read_json(self.config_path)
         except:
             # If base config doesn't exist, create minimal structure
             base_config = {
@@ -235,12 +284,7 @@ class SSHN8NProcessor:
                 }
                 base_config['characters'][char_id] = converted_char
 
-        # Write to temporary file
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8')
-        json.dump(base_config, temp_file, ensure_ascii=False, indent=2)
-        temp_file.close()
-
-        return temp_file.name
+        return base_config
 
 
 def create_sample_n8n_data():
@@ -285,6 +329,90 @@ def create_sample_n8n_data():
     }
 
 
+def _handle_request(processor: SSHN8NProcessor, request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Process one request received by serve()
+
+    Args:
+        processor: Processor with the model loaded
+        request: {"output": path} plus one of {"input_json": path}, {"n8n_data": dict}
+            or {"script": text}, and optionally {"verbose": bool}
+
+    Returns:
+        Reply with "success", "output" and, on failure, "error"
+    """
+    output_file = request.get('output')
+    if not output_file:
+        return {"success": False, "output": None, "error": "Request has no output path"}
+    verbose = bool(request.get('verbose', False))
+
+    if 'script' in request:
+        success = processor.process_direct_script(request['script'], output_file, verbose)
+    else:
+        n8n_data = request.get('n8n_data')
+        if n8n_data is None:
+            if 'input_json' not in request:
+                return {"success": False, "output": output_file,
+                        "error": "Request needs one of input_json, n8n_data or script"}
+            try:
+                n8n_data = _read_json(request['input_json'])
+            except Exception as e:
+                return {"success": False, "output": output_file, "error": f"Could not read input JSON: {e}"}
+        success = processor.process_n8n_output(n8n_data, output_file, verbose)
+
+    reply = {"success": success, "output": output_file}
+    if not success:
+        reply["error"] = "TTS processing failed, see the processor log"
+    return reply
+
+
+def serve(processor: SSHN8NProcessor, socket_path: str):
+    """
+    Serve requests over a Unix socket, loading the model once for all of them
+
+    Clients send one JSON request per line and get one JSON reply per line
+    (see _handle_request). Connections are handled one at a time, since the
+    generator is not thread-safe.
+
+    Args:
+        processor: Processor with the model loaded
+        socket_path: Path of the Unix socket to listen on
+    """
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    reply = _handle_request(processor, _json_loads(line))
+                except Exception as e:
+                    logger.error(f"Error handling request: {e}")
+                    reply = {"success": False, "output": None, "error": str(e)}
+                self.wfile.write(_json_dumps(reply) + b"\n")
+                self.wfile.flush()
+
+    # Remove a socket left behind by a previous run
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    # Requests can write files anywhere the processor can, so the socket is created
+    # private (0600) rather than chmod'ed after it is already listening
+    old_umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(socket_path, RequestHandler)
+    finally:
+        os.umask(old_umask)
+
+    with server:
+        logger.info(f"Serving TTS requests on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Shutting down")
+        finally:
+            os.unlink(socket_path)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="SSH/N8N TTS Processor for IndexTTS2",
@@ -294,8 +422,8 @@ def main():
     # Configuration and output arguments
     parser.add_argument("--config", "-c",
                        help="Character configuration JSON file (optional if JSON input contains character_config)")
-    parser.add_argument("--output", "-o", required=True,
-                       help="Output audio file path")
+    parser.add_argument("--output", "-o",
+                       help="Output audio file path (required unless --serve or --create-sample)")
 
     # Input source (mutually exclusive)
     input_group = parser.add_mutually_exclusive_group(required=True)
@@ -305,18 +433,26 @@ def main():
                             help="Direct script input with character dialogue and emotion tags")
     input_group.add_argument("--create-sample", action="store_true",
                             help="Create sample n8n data for testing")
+    input_group.add_argument("--serve", action="store_true",
+                            help="Keep the model loaded and serve requests from ssh_n8n_client.py over --socket")
 
     # Optional parameters
     parser.add_argument("--model-dir", default="./checkpoints",
                        help="Model directory")
     parser.add_argument("--config-file", default="./checkpoints/config.yaml",
                        help="Model config file")
+    parser.add_argument("--precision", choices=["auto", "bf16", "fp16", "fp32"], default="auto",
+                       help="Model weight precision (auto: bf16 on Ampere and newer GPUs, fp16 otherwise)")
     parser.add_argument("--verbose", action="store_true",
                        help="Enable verbose output")
     parser.add_argument("--log-file",
                        help="Log file path (default: console only)")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET,
+                       help="Unix socket path for --serve")
 
     args = parser.parse_args()
+    if not args.output and not (args.serve or args.create_sample):
+        parser.error("--output is required")
 
     # Set up logging
     if args.log_file:
@@ -326,69 +462,65 @@ def main():
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
 
-    # Determine configuration source
-    config_to_use = args.config
-
-    # For JSON input, check if it contains embedded character config
+    if args.create_sample:
+        # Create sample data, no model needed
+        sample_data = create_sample_n8n_data()
+        sample_file = "sample_n8n_data.json"
+        _write_json(sample_data, sample_file)
+        logger.info(f"Created sample n8n data: {sample_file}")
+        return
+
+    # For JSON input, check if it contains embedded character config; the parsed
+    # payload is kept for processing below
+    n8n_data = None
+    embedded_config = None
     if args.input_json:
         try:
-            with open(args.input_json, 'r', encoding='utf-8') as f:
-                n8n_data = json.load(f)
-
-            # Check if JSON contains embedded character config
+            n8n_data = _read_json(args.input_json)
             embedded_config = n8n_data.get('output', {}).get('character_config')
-            if embedded_config:
-                if args.config:
-                    logger.warning("Both --config and embedded character_config provided. Using embedded config.")
-                # Use embedded config - we'll pass None as config_path and let processor handle it
-                config_to_use = None
-                logger.info("Using embedded character configuration from JSON input")
         except Exception as e:
             logger.warning(f"Could not check JSON input for embedded config: {e}")
 
-    # If no config determined, use default
-    if not config_to_use:
-        default_config = os.path.join(os.path.dirname(__file__), '../config/character_config.json')
-        if os.path.exists(default_config):
-            config_to_use = default_config
-            logger.info(f"Using default character configuration: {default_config}")
+    # Determine configuration source
+    try:
+        config_to_use, embedded_config = resolve_config_source(
+            args.config, embedded_config, info=logger.info, warning=logger.warning)
+    except FileNotFoundError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    if config_to_use is None:
+        # Embedded characters are merged into the default config, when there is one
+        config_to_use = default_config_path()
+        if config_to_use:
+            logger.info(f"Using default character configuration: {config_to_use}")
         else:
             # For SSH processor, we can proceed without initial config if JSON input will provide it
             logger.info("No initial character config provided - will use embedded config from JSON input")
-            config_to_use = None
-
-    # Check if config file exists (if specified)
-    if config_to_use and not os.path.exists(config_to_use):
-        logger.error(f"Configuration file {config_to_use} not found")
-        sys.exit(1)
 
     try:
         # Initialize processor (config_path can be None if JSON input will provide embedded config)
         processor = SSHN8NProcessor(
             config_path=config_to_use,
             model_dir=args.model_dir,
-            config_file=args.config_file
+            config_file=args.config_file,
+            precision=args.precision
         )
 
-        success = False
-
-        if args.create_sample:
-            # Create sample data
-            sample_data = create_sample_n8n_data()
-            sample_file = "sample_n8n_data.json"
-            with open(sample_file, 'w', encoding='utf-8') as f:
-                json.dump(sample_data, f, ensure_ascii=False, indent=2)
-            logger.info(f"Created sample n8n data: {sample_file}")
+        if args.serve:
+            serve(processor, args.socket)
             return
 
-        elif args.input_json:
+        success = False
+
+        if args.input_json:
             # Process from JSON file
-            if not os.path.exists(args.input_json):
-                logger.error(f"Input JSON file {args.input_json} not found")
-                sys.exit(1)
+            if n8n_data is None:
+                if not os.path.exists(args.input_json):
+                    logger.error(f"Input JSON file {args.input_json} not found")
+                    sys.exit(1)
 
-            with open(args.input_json, 'r', encoding='utf-8') as f:
-                n8n_data = json.load(f)
+                n8n_data = _read_json(args.input_json)
 
             success = processor.process_n8n_output(n8n_data, args.output, args.verbose)
 
@@ -404,8 +536,7 @@ def main():
             sys.exit(1)
 
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Unexpected error: {e}")
         sys.exit(1)
 
 
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Snapshot comparison for the parser test scripts
+
+Parsed segments are stored under snapshots/<hash of the script>.json. A missing
+snapshot fails the check; set UPDATE_SNAPSHOTS=1 to record it, or to re-record
+after an intended parser change.
+"""
+
+import os
+import json
+import hashlib
+from dataclasses import asdict
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots")
+
+
+def script_hash(script: str) -> str:
+    """Stable key of a test script"""
+    return hashlib.blake2b(script.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def check_snapshot(script: str, segments) -> bool:
+    """
+    Compare parsed segments against the stored snapshot for this script
+
+    Args:
+        script: Script text the segments were parsed from
+        segments: DialogueSegment list returned by the parser
+
+    Returns:
+        True if the segments match the snapshot (or it was recorded with UPDATE_SNAPSHOTS=1),
+        False if they differ or there is no snapshot; the reason is printed
+    """
+    actual = [asdict(segment) for segment in segments]
+    path = os.path.join(SNAPSHOT_DIR, f"{script_hash(script)}.json")
+
+    if os.environ.get("UPDATE_SNAPSHOTS"):
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(actual, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"📸 Recorded snapshot {path}")
+        return True
+
+    if not os.path.exists(path):
+        print(f"❌ No snapshot {path} for this script, run with UPDATE_SNAPSHOTS=1 to record it")
+        return False
+
+    with open(path, 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+    if actual != expected:
+        print(f"❌ Parsed segments differ from snapshot {path}:")
+        print(f"  expected: {json.dumps(expected, ensure_ascii=False)}")
+        print(f"  actual:   {json.dumps(actual, ensure_ascii=False)}")
+        return False
+    return True
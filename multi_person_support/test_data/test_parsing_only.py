@@ -10,6 +10,7 @@ sys.path.append(current_dir)
 sys.path.append(os.path.join(current_dir, "scripts"))
 
 from multi_character_emotion_generator import CharacterDialogueParser
+from snapshot_utils import check_snapshot
 
 def test_descriptive_emotion_parsing():
     """Test that descriptive emotion text is parsed correctly"""
@@ -75,6 +76,9 @@ def test_descriptive_emotion_parsing():
         if segment.emo_text:
             print(f"     → Descriptive: {segment.emo_text}")
 
+    assert check_snapshot(sample_script, segments), "Parsed segments don't match the snapshot"
+    print("\n✅ Parsed segments match snapshot")
+
     print("\n" + "=" * 50)
     print("✅ All tests completed successfully!")
 
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test that the compiled sentence splitter of multi_character_emotion_generator matches the regex split
+
+TextSegmenter._iter_sentences only switches to _sentence_ends from _JIT_MIN_CHARS characters
+on, so short test scripts never exercise it. Here the threshold is forced to 0.
+"""
+
+import sys
+import os
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+sys.path.append(os.path.join(parent_dir, "scripts"))
+
+import numpy as np
+
+import multi_character_emotion_generator as mceg
+from multi_character_emotion_generator import TextSegmenter
+
+TEST_TEXTS = [
+    # Mixed Chinese and English terminators
+    "今天天气很好。我们去公园吧！你觉得呢？Sure. Let's go! Really?",
+    # Trailing text without a terminator
+    "First sentence. Second sentence without end",
+    # Text ending in a terminator leaves an empty trailing sentence
+    "One. Two!",
+    # Consecutive terminators
+    "Wait... What?! 真的吗？！好。。。",
+    # No terminator at all, and nothing but terminators
+    "no terminator here",
+    "。！？.!?",
+    # Empty text
+    "",
+]
+
+
+def _split_regex(text: str):
+    """Split with the _SENTENCE_SPLIT_RE branch"""
+    saved = mceg._JIT_MIN_CHARS
+    mceg._JIT_MIN_CHARS = float('inf')
+    try:
+        return list(TextSegmenter._iter_sentences(text))
+    finally:
+        mceg._JIT_MIN_CHARS = saved
+
+
+def _split_jit(text: str):
+    """Split with the compiled branch (plain Python when numba isn't installed)"""
+    saved = mceg._JIT_MIN_CHARS
+    mceg._JIT_MIN_CHARS = 0
+    try:
+        if mceg._HAS_NUMBA:
+            return list(TextSegmenter._iter_sentences(text))
+        codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        sentences, start = [], 0
+        for end in mceg._sentence_ends(codepoints).tolist():
+            sentences.append(text[start:end])
+            start = end
+        return sentences
+    finally:
+        mceg._JIT_MIN_CHARS = saved
+
+
+def test_sentence_split_parity():
+    """Test that both sentence splitting branches produce the same sentences"""
+
+    print("🧪 Testing compiled sentence splitting against the regex split")
+    print(f"numba available: {mceg._HAS_NUMBA}")
+    print("=" * 50)
+
+    for i, text in enumerate(TEST_TEXTS, 1):
+        expected = _split_regex(text)
+        actual = _split_jit(text)
+        print(f"Test Case {i}: {text!r}")
+        print(f"  Sentences: {expected}")
+        assert actual == expected, f"Mismatch for {text!r}:\n  regex: {expected}\n  jit:   {actual}"
+
+    # The regex split always ends with the text after the last terminator, empty or not
+    assert _split_regex("One. Two!")[-1] == ""
+
+    print("\n" + "=" * 50)
+    print("✅ Compiled and regex sentence splitting match!")
+
+
+if __name__ == "__main__":
+    test_sentence_split_parity()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test that the compiled tag parsing path of long_text_emotion_generator matches the pure Python path
+
+parse_emotion_tags only switches to _parse_tag_matches_jit from _JIT_MIN_TAGS tags on,
+so short test scripts never exercise it. Here the threshold is forced to 0.
+"""
+
+import sys
+import os
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+sys.path.append(os.path.join(parent_dir, "scripts"))
+
+import long_text_emotion_generator as ltg
+from long_text_emotion_generator import EmotionTagParser
+
+TEST_TEXTS = [
+    # Plain tags, with and without alpha
+    "[happy]Hello world! [sad:0.5]Goodbye... [angry:1.0]Stop it!",
+    # Unicode whitespace around segments: no-break space, ideographic space, tabs, newlines
+    "[高兴]\xa0今天天气很好　[悲伤:0.3]　　可是下雨了\xa0\n[平静]\t好吧\t",
+    # Whitespace-only and empty gaps between consecutive tags
+    "[happy] \xa0 [sad]　[calm][afraid:0.2]Finally some text",
+    # Text before the first tag and after the last tag
+    "Intro text\xa0[surprised:0.9]Wow!　[calm]",
+    # Multi-character tags mixed with plain tags, unusual alphas
+    "{[narrator]:[calm:0.3]}　Once upon a time\xa0{[tom]:[happy:abc]}Hi![sad:-1] Oh.[happy:1e-1]Hmm",
+    # Tags only
+    "[happy][sad:0.4]\xa0[calm]",
+]
+
+
+def _parse_python(parser: EmotionTagParser, text: str):
+    """Parse with the pure Python loop"""
+    saved = ltg._JIT_MIN_TAGS
+    ltg._JIT_MIN_TAGS = float('inf')
+    try:
+        return parser.parse_emotion_tags(text).to_dicts()
+    finally:
+        ltg._JIT_MIN_TAGS = saved
+
+
+def _parse_jit(parser: EmotionTagParser, text: str):
+    """Parse with the compiled path (plain Python when numba isn't installed)"""
+    saved = ltg._JIT_MIN_TAGS
+    ltg._JIT_MIN_TAGS = 0
+    try:
+        if ltg._HAS_NUMBA:
+            return parser.parse_emotion_tags(text).to_dicts()
+        return parser._parse_tag_matches_jit(text, list(ltg._COMBINED_RE.finditer(text))).to_dicts()
+    finally:
+        ltg._JIT_MIN_TAGS = saved
+
+
+def test_tag_parsing_parity():
+    """Test that both parsing paths produce the same segments"""
+
+    print("🧪 Testing compiled tag parsing against the Python path")
+    print(f"numba available: {ltg._HAS_NUMBA}")
+    print("=" * 50)
+
+    parser = EmotionTagParser()
+    for i, text in enumerate(TEST_TEXTS, 1):
+        expected = _parse_python(parser, text)
+        actual = _parse_jit(parser, text)
+        print(f"Test Case {i}: {text!r}")
+        print(f"  Segments: {len(expected)}")
+        assert actual == expected, f"Mismatch for {text!r}:\n  python: {expected}\n  jit:    {actual}"
+
+    print("\n" + "=" * 50)
+    print("✅ Compiled and Python tag parsing match!")
+
+
+if __name__ == "__main__":
+    test_tag_parsing_parity()
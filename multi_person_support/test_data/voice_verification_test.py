@@ -6,11 +6,19 @@ Test script to verify voice assignment and character detection
 import sys
 import os
 import json
+from functools import lru_cache
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 sys.path.append(os.path.join(parent_dir, "scripts"))
 
+from snapshot_utils import check_snapshot
+
+@lru_cache(maxsize=256)
+def _voice_exists(path: str) -> bool:
+    """Stat each voice file once; several characters often share one"""
+    return os.path.exists(path)
+
 def test_voice_assignment():
     """Test that characters are assigned correct voice files"""
 
@@ -38,10 +46,13 @@ def test_voice_assignment():
     print(f"📋 Found {len(segments)} segments:")
     print()
 
+    # Voice file of each character the script uses, in order of first appearance
+    voices_used = {}
     for i, segment in enumerate(segments, 1):
         char_config = parser.characters.get(segment.character)
         char_name = char_config.name if char_config else segment.character
         voice_file = char_config.voice_file if char_config else "NOT FOUND"
+        voices_used.setdefault(segment.character, voice_file if char_config else None)
 
         print(f"Segment {i}:")
         print(f"  Character: {segment.character}")
@@ -54,6 +65,10 @@ def test_voice_assignment():
         print(f"  Text: {segment.text}")
         print()
 
+    assert check_snapshot(script_content, segments), "Parsed segments don't match the snapshot"
+    print("✅ Parsed segments match snapshot")
+    print()
+
     # Check character configuration
     print("📋 Character Configuration:")
     print("=" * 30)
@@ -66,12 +81,13 @@ def test_voice_assignment():
         print(f"  Volume: {char_config.volume}")
         print()
 
-    # Verify voice files exist
+    # Verify voice files of the characters in the script exist
     print("🔍 Voice File Verification:")
     print("=" * 30)
-    for char_id, char_config in parser.characters.items():
-        voice_file = char_config.voice_file
-        if os.path.exists(voice_file):
+    for char_id, voice_file in voices_used.items():
+        if voice_file is None:
+            print(f"❌ {char_id}: not in character configuration")
+        elif _voice_exists(os.path.abspath(voice_file)):
             print(f"✅ {char_id}: {voice_file} (EXISTS)")
         else:
             print(f"❌ {char_id}: {voice_file} (NOT FOUND)")